@@ -6,12 +6,13 @@
 # Description: 
 # License: MIT
 
-from .pips import PipsError, PyPIClient, PackageDownloader, PackageInstaller, StatisticsDisplay, parse_package_spec, get_save_directory, validate_version
+from .pips import PipsError, NotFoundError, PyPIClient, PackageDownloader, PackageInstaller, StatisticsDisplay, parse_package_spec, get_save_directory, validate_version
 
 from __version__ import version
 
 __all__ = [
 	"PipsError",
+	"NotFoundError",
 	"PyPIClient",
 	"PackageDownloader",
 	"PackageInstaller",
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+# File: pips/daemon.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Resident pips daemon (pips serve) and its Unix socket client
+# License: MIT
+
+"""
+daemon.py
+
+`pips serve` keeps one process alive with a warm in-memory metadata cache,
+the Redis pool and an index of installed distributions. pips and pipr talk
+to it over a Unix socket with one JSON object per line:
+
+    -> {"op": "fetch", "url": "...", "cache_key": "package_info:requests"}
+    <- {"ok": true, "result": {...}}
+    <- {"ok": false, "error": "...", "status": 404}
+
+When no daemon is running the client raises DaemonUnavailable and callers
+fall back to their own cache tiers, so the daemon is purely optional.
+"""
+
+import os
+import re
+import json
+import time
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+
+try:
+    from .installed import InstalledIndex, search_paths  # type: ignore
+except ImportError:
+    from installed import InstalledIndex, search_paths  # type: ignore
+
+logger = logging.getLogger('pips')
+
+CONNECT_TIMEOUT = 0.2   # A missing or hung daemon must never slow the CLI down
+REQUEST_TIMEOUT = 60.0  # Upstream fetches done by the daemon can take a while
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket"""
+
+
+class DaemonError(Exception):
+    """The daemon handled the request but the operation failed"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status  # Upstream HTTP status, e.g. 404 for an unknown package
+
+
+def get_socket_path() -> Path:
+    """Socket path from PIPS_DAEMON_SOCKET, default ~/.pips/pips.sock"""
+    return Path(os.getenv('PIPS_DAEMON_SOCKET', '') or Path.home() / '.pips' / 'pips.sock')
+
+
+def daemon_enabled() -> bool:
+    """Daemon use can be switched off with PIPS_DAEMON=0"""
+    return str(os.getenv('PIPS_DAEMON', '1')).lower() not in ['0', 'false', 'no', 'off']
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized distribution name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class DaemonClient:
+    """Send requests to a running `pips serve` over its Unix socket"""
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        self.socket_path = Path(socket_path or get_socket_path())
+        self.available = hasattr(socket, 'AF_UNIX') and self.socket_path.exists()
+
+    def call(self, op: str, **params) -> Any:
+        """
+        Run one operation on the daemon
+
+        Raises:
+            DaemonUnavailable: No daemon listening (the client stops trying for its lifetime)
+            DaemonError: The operation itself failed inside the daemon
+        """
+        if not self.available:
+            raise DaemonUnavailable(f"No pips daemon at {self.socket_path}")
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(CONNECT_TIMEOUT)
+                sock.connect(str(self.socket_path))
+                sock.settimeout(REQUEST_TIMEOUT)
+                sock.sendall(json.dumps({'op': op, **params}).encode('utf-8') + b"\n")
+                with sock.makefile('rb') as reader:
+                    line = reader.readline()
+        except OSError as e:
+            self.available = False
+            logger.debug(f"pips daemon unavailable ({e}), falling back to local lookups")
+            raise DaemonUnavailable(str(e))
+
+        if not line:
+            self.available = False
+            raise DaemonUnavailable("pips daemon closed the connection")
+
+        response = json.loads(line.decode('utf-8'))
+        if not response.get('ok'):
+            raise DaemonError(response.get('error', 'unknown daemon error'), response.get('status'))
+        return response.get('result')
+
+
+class PipsDaemon:
+    """Long-lived server holding a warm metadata cache and installed-distribution index"""
+
+    def __init__(self, client, socket_path: Optional[Path] = None, max_entries: int = 5000,
+                 idle_timeout: float = 0, version: str = ""):
+        """
+        Args:
+            client: PyPIClient used for misses (file/Redis tiers and network)
+            max_entries: In-memory metadata entries kept (least recently used are dropped)
+            idle_timeout: Exit after this many seconds without requests (0 = never)
+        """
+        self.client = client
+        self.socket_path = Path(socket_path or get_socket_path())
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self.version = version
+        self.started = time.time()
+        self.last_request = time.time()
+        self.requests = 0
+        self.memory_hits = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._installed: Dict[tuple, InstalledIndex] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'ping': self.op_ping,
+            'stats': self.op_stats,
+            'fetch': self.op_fetch,
+            'installed_version': self.op_installed_version,
+            'shutdown': self.op_shutdown,
+        }
+
+    # Operations -----------------------------------------------------------
+
+    def op_ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {'pid': os.getpid(), 'uptime': time.time() - self.started, 'version': self.version}
+
+    def op_stats(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._memory)
+        return {
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started,
+            'requests': self.requests,
+            'memory_entries': entries,
+            'memory_hits': self.memory_hits,
+            'tier_hits': dict(self.client.hits),
+            'installed_indexes': len(self._installed),
+        }
+
+    def op_fetch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Metadata lookup: memory first, then the client's cache tiers and PyPI"""
+        url = request['url']
+        cache_key = request.get('cache_key') or url
+        refresh = bool(request.get('refresh'))
+
+        if not refresh:
+            with self._lock:
+                entry = self._memory.get(cache_key)
+                if entry and entry[0] > time.time():
+                    self._memory.move_to_end(cache_key)
+                    self.memory_hits += 1
+                    return entry[1]
+
+        data = self.client._fetch_json(url, request.get('cache_key'), refresh=refresh)
+
+        with self._lock:
+            self._memory[cache_key] = (time.time() + self.client.CACHE_EXPIRY, data)
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return data
+
+    def op_installed_version(self, request: Dict[str, Any]) -> Optional[str]:
+        """Installed version of a distribution for the caller's sys.path (None if missing)"""
+        paths = tuple(search_paths(request.get('paths', [])))
+
+        with self._lock:
+            index = self._installed.get(paths)
+        # Installing or removing a distribution touches its site-packages directory
+        if not index or not index.is_current():
+            index = InstalledIndex.load(paths)
+            with self._lock:
+                self._installed[paths] = index
+        return index.version(request['name'])
+
+    def op_shutdown(self, request: Dict[str, Any]) -> bool:
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return True
+
+    # Server ---------------------------------------------------------------
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one request, errors are returned to the caller instead of raised"""
+        with self._lock:
+            self.last_request = time.time()
+            self.requests += 1
+        handler = self.handlers.get(request.get('op'))
+        if not handler:
+            return {'ok': False, 'error': f"Unknown operation: {request.get('op')}"}
+        try:
+            return {'ok': True, 'result': handler(request)}
+        except Exception as e:
+            logger.debug(f"Daemon {request.get('op')} failed: {e}")
+            response = {'ok': False, 'error': str(e)}
+            # Lets clients tell "not found" from other failures
+            if getattr(e, 'status', None):
+                response['status'] = e.status
+            return response
+
+    def _remove_stale_socket(self) -> None:
+        """Refuse to start twice, clean up a socket left behind by a dead daemon"""
+        if not self.socket_path.exists():
+            return
+        try:
+            DaemonClient(self.socket_path).call('ping')
+        except DaemonUnavailable:
+            self.socket_path.unlink()
+            return
+        raise RuntimeError(f"pips daemon already running at {self.socket_path}")
+
+    def _watch_idle(self) -> None:
+        while True:
+            time.sleep(min(self.idle_timeout, 30))
+            if time.time() - self.last_request >= self.idle_timeout:
+                logger.info("pips daemon idle, shutting down")
+                self._server.shutdown()
+                return
+
+    def serve(self) -> None:
+        """Serve until shutdown (blocking)"""
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line.decode('utf-8'))
+                    except ValueError as e:
+                        response = {'ok': False, 'error': f"Invalid request: {e}"}
+                    else:
+                        response = daemon.handle(request)
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+                    self.wfile.flush()
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_socket()
+
+        old_umask = os.umask(0o077)  # Socket is private to the user
+        try:
+            self._server = Server(str(self.socket_path), Handler)
+        finally:
+            os.umask(old_umask)
+
+        if self.idle_timeout:
+            threading.Thread(target=self._watch_idle, daemon=True).start()
+
+        logger.info(f"pips daemon listening on {self.socket_path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+# File: pips/index.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Static PEP 503/691 index for a local download directory (pips index)
+# License: MIT
+
+"""
+index.py
+
+Turn a directory filled by `pips -s -b -m ...` into an index pip can use
+directly:
+
+    pip install --index-url file://<dir>/simple <package>
+
+Pages are written to <dir>/simple/<project>/ with sha256 fragments. The
+file size, mtime and digest of every artifact are remembered in
+<dir>/.pips-index.json, so a re-run only hashes new or modified files and
+only rewrites the pages of projects whose files changed.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import quote
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+try:
+    from .simple import canonical_name, write_project_pages, write_index_pages, write_atomic, file_sha256  # type: ignore
+except ImportError:
+    from simple import canonical_name, write_project_pages, write_index_pages, write_atomic, file_sha256  # type: ignore
+
+logger = logging.getLogger('pips')
+
+STATE_VERSION = 1
+ARCHIVE_SUFFIXES = ('.whl', '.tar.gz', '.tgz', '.tar.bz2', '.zip', '.egg')
+SKIP_DIRS = {'simple', '__pycache__'}
+
+
+def split_filename(filename: str) -> Optional[Tuple[str, str]]:
+    """(canonical project name, version) of a wheel or sdist file name (None if it is not one)"""
+    lower = filename.lower()
+    if not lower.endswith(ARCHIVE_SUFFIXES):
+        return None
+
+    from packaging.utils import parse_wheel_filename, parse_sdist_filename, InvalidWheelFilename, InvalidSdistFilename
+    try:
+        if lower.endswith('.whl'):
+            name, version = parse_wheel_filename(filename)[:2]
+            return canonical_name(str(name)), str(version)
+        if lower.endswith(('.tar.gz', '.zip')):
+            name, version = parse_sdist_filename(filename)
+            return canonical_name(str(name)), str(version)
+    except (InvalidWheelFilename, InvalidSdistFilename):
+        pass
+
+    # Legacy names (eggs, .tgz, odd sdists): the name ends where the version starts
+    stem = re.sub(r'\.(whl|tar\.gz|tgz|tar\.bz2|zip|egg)$', '', filename, flags=re.IGNORECASE)
+    match = re.match(r'^(.+?)-(\d[^-]*)', stem)
+    return (canonical_name(match.group(1)), match.group(2)) if match else None
+
+
+def project_from_filename(filename: str) -> Optional[str]:
+    """Canonical project name of a wheel or sdist file name (None if it is not one)"""
+    parsed = split_filename(filename)
+    return parsed[0] if parsed else None
+
+
+def wheel_requires_python(path: Path) -> Optional[str]:
+    """Requires-Python of a wheel from its METADATA (None if absent or unreadable)"""
+    import zipfile
+    from email.parser import HeaderParser
+
+    try:
+        with zipfile.ZipFile(path) as zf:
+            name = next((n for n in zf.namelist() if n.endswith('.dist-info/METADATA') and n.count('/') == 1), None)
+            if not name:
+                return None
+            headers = HeaderParser().parsestr(zf.read(name).decode('utf-8', errors='replace'))
+        return headers.get('Requires-Python')
+    except (OSError, zipfile.BadZipFile, KeyError):
+        return None
+
+
+class LocalIndex:
+    """Incrementally maintained simple index over a directory of downloaded artifacts"""
+
+    STATE_NAME = '.pips-index.json'
+
+    def __init__(self, root: Path, workers: int = 8):
+        """
+        Args:
+            root: Download directory (scanned recursively, pages go to root/simple)
+            workers: Files hashed in parallel
+        """
+        self.root = Path(root)
+        self.simple_dir = self.root / 'simple'
+        self.workers = max(1, workers)
+        self.state = self._load_state()
+
+    # State ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.root / self.STATE_NAME, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                return state
+            logger.warning("Index state has an unknown version, rebuilding the index")
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.warning(f"Index state unreadable ({e}), rebuilding the index")
+        return {'version': STATE_VERSION, 'files': {}, 'projects': {}}
+
+    def _save_state(self) -> None:
+        write_atomic(self.root / self.STATE_NAME, json.dumps(self.state, indent=1, sort_keys=True).encode('utf-8'))
+
+    def digest(self, path: Path) -> str:
+        """sha256 of an artifact, taken from the saved state while the file is unchanged"""
+        path = Path(path)
+        st = path.stat()
+        try:
+            relpath = path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            relpath = None
+        known = self.state['files'].get(relpath) if relpath else None
+        if known and known['size'] == st.st_size and known['mtime'] == st.st_mtime_ns:
+            return known['sha256']
+        return file_sha256(path)
+
+    # Scan -------------------------------------------------------------------
+
+    def scan(self) -> Dict[str, os.stat_result]:
+        """Relative path -> stat of every artifact under the root"""
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if Path(dirpath) == self.root:
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+            else:
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for filename in filenames:
+                # Hidden names include the partial downloads of PackageDownloader
+                if filename.startswith('.') or not filename.lower().endswith(ARCHIVE_SUFFIXES):
+                    continue
+                path = Path(dirpath) / filename
+                try:
+                    found[path.relative_to(self.root).as_posix()] = path.stat()
+                except OSError:
+                    continue
+        return found
+
+    def _describe(self, relpath: str, st: os.stat_result) -> Dict[str, Any]:
+        path = self.root / relpath
+        filename = path.name
+        return {
+            'project': project_from_filename(filename),
+            'size': st.st_size,
+            'mtime': st.st_mtime_ns,
+            'sha256': file_sha256(path),
+            'requires_python': wheel_requires_python(path) if filename.lower().endswith('.whl') else None,
+        }
+
+    # Build ------------------------------------------------------------------
+
+    def update(self, full: bool = False, progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Bring the pages in line with the directory contents
+
+        Args:
+            full: Re-hash every file and rewrite every page
+            progress: Called with each relative path once it has been hashed
+        """
+        start = time.time()
+        known = {} if full else self.state['files']
+        found = self.scan()
+
+        stale = [
+            relpath for relpath, st in found.items()
+            if relpath not in known or known[relpath]['size'] != st.st_size or known[relpath]['mtime'] != st.st_mtime_ns
+        ]
+
+        files = {relpath: known[relpath] for relpath in found if relpath not in stale}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._describe, relpath, found[relpath]): relpath for relpath in stale}
+            for future in as_completed(futures):
+                relpath = futures[future]
+                try:
+                    files[relpath] = future.result()
+                except OSError as e:
+                    errors[relpath] = str(e)
+                    logger.warning(f"Index: cannot hash {relpath}: {e}")
+                if progress:
+                    progress(relpath)
+
+        projects: Dict[str, List[str]] = {}
+        for relpath in sorted(files):
+            if files[relpath]['project']:
+                projects.setdefault(files[relpath]['project'], []).append(relpath)
+
+        previous = {} if full else self.state['projects']
+        signatures = {name: self._signature(relpaths, files) for name, relpaths in projects.items()}
+        changed = [
+            name for name, signature in signatures.items()
+            if previous.get(name) != signature or not (self.simple_dir / name / 'index.html').is_file()
+        ]
+        removed = [name for name in previous if name not in projects]
+
+        for name in changed:
+            self._write_project(name, projects[name], files)
+        for name in removed:
+            shutil.rmtree(self.simple_dir / name, ignore_errors=True)
+        if changed or removed or not (self.simple_dir / 'index.html').is_file():
+            write_index_pages(self.simple_dir, projects)
+
+        self.state = {'version': STATE_VERSION, 'files': files, 'projects': signatures}
+        self._save_state()
+
+        return {
+            'files': len(files),
+            'hashed': len(stale) - len(errors),
+            'projects': len(projects),
+            'changed': len(changed),
+            'removed': len(removed),
+            'errors': errors,
+            'elapsed': time.time() - start,
+        }
+
+    @staticmethod
+    def _signature(relpaths: List[str], files: Dict[str, Dict[str, Any]]) -> str:
+        digest = hashlib.sha256()
+        for relpath in relpaths:
+            digest.update(f"{relpath}\0{files[relpath]['sha256']}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _write_project(self, name: str, relpaths: List[str], files: Dict[str, Dict[str, Any]]) -> None:
+        entries, seen = [], set()
+        for relpath in relpaths:
+            filename = relpath.rsplit('/', 1)[-1]
+            # The same artifact downloaded into two subfolders is listed once
+            if filename in seen:
+                logger.debug(f"Index: duplicate {filename} at {relpath} ignored")
+                continue
+            seen.add(filename)
+            info = files[relpath]
+            entries.append({
+                'filename': filename,
+                'relpath': relpath,
+                'hashes': {'sha256': info['sha256']},
+                'requires_python': info.get('requires_python'),
+                'yanked': False,
+                'size': info['size'],
+            })
+        entries.sort(key=lambda f: f['filename'])
+        # Links are relative so the directory can be moved or served over HTTP as is
+        write_project_pages(self.simple_dir, name, entries,
+                            lambda f: quote(f"../../{f['relpath']}"))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# File: pips/installed.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Persistent index of installed distributions for pipr checks
+# License: MIT
+
+"""
+installed.py
+
+`importlib.metadata.version()` walks every sys.path entry and its dist-info
+directories on each call. pipr asks for hundreds of names per run, so it
+reads one index instead: canonical name -> version, top-level modules (and
+the packages it ships below namespace packages) and requirements for every
+installed distribution.
+
+The index is saved under ~/.pips/installed/ and keyed by the mtimes of the
+sys.path directories. Installing, upgrading or removing a distribution
+adds or removes a dist-info directory, which changes the mtime, so a saved
+index is only used while the environment is unchanged.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+logger = logging.getLogger('pips')
+
+INDEX_VERSION = 2
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized distribution name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def search_paths(paths: Optional[Iterable[str]] = None) -> List[str]:
+    """Absolute, de-duplicated sys.path entries in lookup order"""
+    seen, result = set(), []
+    for entry in (sys.path if paths is None else paths):
+        path = os.path.abspath(entry or os.curdir)
+        if path not in seen:
+            seen.add(path)
+            result.append(path)
+    return result
+
+
+def path_stamp(paths: List[str]) -> List[int]:
+    """mtime of every search path (0 if missing), changes whenever a distribution is added or removed"""
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(0)
+    return stamp
+
+
+def get_index_dir() -> Path:
+    return Path.home() / '.pips' / 'installed'
+
+
+def _top_level(dist) -> List[str]:
+    """Importable top-level names of a distribution"""
+    text = dist.read_text('top_level.txt')
+    if text:
+        return sorted({line.strip() for line in text.splitlines() if line.strip()})
+
+    modules = set()
+    for file in dist.files or []:
+        parts = file.parts
+        if not parts or parts[0] in ('..', '__pycache__') or parts[0].endswith(('.dist-info', '.egg-info', '.data')):
+            continue
+        if len(parts) == 1:
+            name = parts[0]
+            if name.endswith('.py'):
+                modules.add(name[:-3])
+            elif name.endswith(('.so', '.pyd')):
+                modules.add(name.split('.', 1)[0])
+        else:
+            modules.add(parts[0])
+    return sorted(modules)
+
+
+def namespace_modules(names: Iterable[str]) -> List[str]:
+    """
+    Dotted paths below namespace packages in a file list (google.protobuf for google/protobuf/...)
+
+    A top-level directory without __init__.py is shared by several
+    distributions. What tells them apart is the first regular package (or
+    module) below it.
+    """
+    files = [name.split('/') for name in names]
+    regular = {tuple(parts[:-1]) for parts in files if parts[-1] == '__init__.py'}
+    modules = set()
+    for parts in files:
+        if len(parts) < 2 or not parts[-1].endswith(('.py', '.so', '.pyd')):
+            continue
+        if parts[0] in ('..', '__pycache__') or parts[0].endswith(('.dist-info', '.egg-info', '.data')):
+            continue
+        if (parts[0],) in regular:
+            continue
+        path = parts[:-1] + [parts[-1].split('.', 1)[0]]
+        for depth in range(2, len(parts)):
+            if tuple(parts[:depth]) in regular:
+                path = parts[:depth]
+                break
+        if all(part.isidentifier() for part in path):
+            modules.add('.'.join(path))
+    return sorted(modules)
+
+
+class InstalledIndex:
+    """Installed distributions of one search path, looked up by canonical name"""
+
+    def __init__(self, paths: List[str], stamp: List[int], dists: Dict[str, Dict[str, Any]]):
+        self.paths = paths
+        self.stamp = stamp
+        self.dists = dists
+
+    @classmethod
+    def build(cls, paths: Optional[Iterable[str]] = None) -> 'InstalledIndex':
+        """Walk the search path once (first match wins, like importlib.metadata)"""
+        from importlib import metadata
+
+        paths = search_paths(paths)
+        stamp = path_stamp(paths)
+        start = time.time()
+        dists: Dict[str, Dict[str, Any]] = {}
+        for dist in metadata.distributions(path=paths):
+            name = dist.metadata['Name']
+            if not name or canonical_name(name) in dists:
+                continue
+            try:
+                top_level = _top_level(dist)
+                namespaces = namespace_modules('/'.join(file.parts) for file in dist.files or [])
+            except Exception as e:
+                logger.debug(f"Cannot list modules of {name}: {e}")
+                top_level, namespaces = [], []
+            dists[canonical_name(name)] = {
+                'name': name,
+                'version': dist.version,
+                'top_level': top_level,
+                'namespaces': namespaces,
+                'requires': list(dist.requires or []),
+            }
+        logger.debug(f"Indexed {len(dists)} installed distributions in {time.time() - start:.3f}s")
+        return cls(paths, stamp, dists)
+
+    @classmethod
+    def load(cls, paths: Optional[Iterable[str]] = None, index_dir: Optional[Path] = None) -> 'InstalledIndex':
+        """Saved index for these paths if the environment is unchanged, otherwise a fresh (saved) one"""
+        paths = search_paths(paths)
+        stamp = path_stamp(paths)
+        index_file = Path(index_dir or get_index_dir()) / f"{hashlib.sha256(os.pathsep.join(paths).encode('utf-8')).hexdigest()[:16]}.json"
+
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and data.get('paths') == paths and data.get('stamp') == stamp:
+                return cls(paths, stamp, data['dists'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = cls.build(paths)
+        index.save(index_file)
+        return index
+
+    def save(self, index_file: Path) -> None:
+        try:
+            index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = index_file.with_name(f".{index_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'paths': self.paths, 'stamp': self.stamp, 'dists': self.dists}, f)
+            os.replace(tmp_file, index_file)
+        except OSError as e:
+            logger.debug(f"Cannot save installed index: {e}")
+
+    def is_current(self) -> bool:
+        return path_stamp(self.paths) == self.stamp
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.dists.get(canonical_name(name))
+
+    def version(self, name: str) -> Optional[str]:
+        dist = self.get(name)
+        return dist['version'] if dist else None
+
+    def versions(self) -> Dict[str, str]:
+        return {name: dist['version'] for name, dist in self.dists.items()}
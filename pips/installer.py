@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# File: pips/installer.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Batched pip installs with per-package failure attribution
+# License: MIT
+
+"""
+installer.py
+
+Install a whole requirement set with one pip process, so pip resolves it
+once (and consistently) instead of once per package. When the batch fails,
+pip's output is parsed to find which requirements broke it; those are set
+aside, the rest is installed as a batch again, and only the failures are
+retried on their own.
+"""
+
+import os
+import re
+import logging
+import tempfile
+import subprocess
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+logger = logging.getLogger('pips')
+
+NAME_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+# pip error lines naming the requirement they are about
+FAILURE_PATTERNS = [
+    re.compile(r"Could not find a version that satisfies the requirement ([^\s(]+)"),
+    re.compile(r"No matching distribution found for ([^\s(]+)"),
+    re.compile(r"Invalid requirement: '([^']+)'"),
+    re.compile(r"Failed building wheel for ([^\s,]+)"),
+    # Before the generic "Failed to build", which would read its words as names
+    re.compile(r"Failed to build installable wheels for some pyproject\.toml based projects \(([^)]+)\)"),
+    re.compile(r"Failed to build ([^\s(]+(?: [^\s(]+)*)$"),
+    re.compile(r"Could not build wheels for ([^\n]+?)(?:,? which| because|$)"),
+    re.compile(r"Cannot install (.+?) because these package versions have conflicting dependencies"),
+]
+COLLECTING_PATTERN = re.compile(r"^Collecting ([^\s(]+)")
+BUILD_FAILURE_MARKERS = ('metadata-generation-failed', 'subprocess-exited-with-error')
+
+
+def requirement_name(spec: str) -> Optional[str]:
+    """Canonical project name of a requirement string (None if it has none)"""
+    match = NAME_PATTERN.match(spec)
+    return re.sub(r"[-_.]+", "-", match.group(1)).lower() if match else None
+
+
+class BatchInstaller:
+    """Run one pip process for a requirement set and attribute failures to packages"""
+
+    def __init__(self, pip_cmd: List[str], extra_args: Optional[List[str]] = None, timeout: Optional[float] = None):
+        """
+        Args:
+            pip_cmd: Command that runs pip, e.g. [sys.executable, '-m', 'pip']
+            extra_args: Appended to every `pip install` (e.g. ['--user'])
+            timeout: Seconds allowed per pip process (None = no limit)
+        """
+        self.pip_cmd = list(pip_cmd)
+        self.extra_args = list(extra_args or [])
+        self.timeout = timeout
+
+    def _run(self, specs: List[str], on_line: Optional[Callable[[str], None]] = None) -> Tuple[int, str]:
+        """pip install one set of requirements, returns (exit code, combined output)"""
+        # A requirements file keeps markers and long sets out of the command line
+        fd, req_file = tempfile.mkstemp(prefix='pips-batch-', suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write("\n".join(specs) + "\n")
+            cmd = self.pip_cmd + ['install', '-r', req_file] + self.extra_args
+            logger.debug(f"Running: {' '.join(cmd)} ({len(specs)} requirement(s))")
+
+            lines = []
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                       errors='replace')
+            try:
+                for line in process.stdout:  # type: ignore
+                    lines.append(line)
+                    if on_line:
+                        on_line(line.rstrip())
+                returncode = process.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                lines.append(f"ERROR: pip timed out after {self.timeout}s\n")
+                returncode = -1
+            return returncode, "".join(lines)
+        finally:
+            try:
+                os.unlink(req_file)
+            except OSError:
+                pass
+
+    @staticmethod
+    def last_error(output: str) -> str:
+        """Most relevant error line of a pip run"""
+        errors = [line.strip() for line in output.splitlines() if line.strip().startswith(('ERROR:', 'error:'))]
+        if errors:
+            return errors[-1]
+        tail = [line.strip() for line in output.splitlines() if line.strip()]
+        return tail[-1] if tail else "pip failed"
+
+    @staticmethod
+    def attribute_failures(output: str, specs: List[str]) -> Dict[str, str]:
+        """
+        Map the requirements of a failed batch to the pip error that names them
+
+        Returns:
+            dict: spec -> error line, only for specs pip's output can be tied to
+        """
+        by_name = {}
+        for spec in specs:
+            name = requirement_name(spec)
+            if name:
+                by_name.setdefault(name, []).append(spec)
+
+        blamed: Dict[str, str] = {}
+        last_collecting = None
+        for line in output.splitlines():
+            text = line.strip()
+            collecting = COLLECTING_PATTERN.match(text)
+            if collecting:
+                last_collecting = collecting.group(1)
+                continue
+
+            names = []
+            for pattern in FAILURE_PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    names = re.split(r",\s*|\s+and\s+|\s+", match.group(1).strip())
+                    break
+            # Build errors only name "the package mentioned above"
+            if not names and last_collecting and any(marker in text for marker in BUILD_FAILURE_MARKERS):
+                names = [last_collecting]
+
+            for token in names:
+                name = requirement_name(token)
+                for spec in by_name.get(name or '', []):
+                    blamed.setdefault(spec, text)
+        return blamed
+
+    def install(self, specs: List[str], retries: int = 0,
+                on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Install a requirement set, batching everything that can be batched
+
+        Args:
+            specs: Requirement strings (name, name==1.0, name>=2; python_version < "3.12", ...)
+            retries: Extra single-package attempts for failures pip already attributed
+            on_line: Called with every line pip prints
+
+        Returns:
+            dict: installed (specs), failed (spec -> error line), runs (pip processes started)
+        """
+        pending = list(dict.fromkeys(s for s in specs if s and s.strip()))
+        installed: List[str] = []
+        failed: Dict[str, str] = {}
+        unattributed: List[str] = []
+        runs = 0
+
+        while pending:
+            returncode, output = self._run(pending, on_line)
+            runs += 1
+            if returncode == 0:
+                installed.extend(pending)
+                break
+
+            blamed = self.attribute_failures(output, pending)
+            if not blamed:
+                # Nothing in the output points at a requirement: try each one alone
+                logger.info(f"pip batch failed without naming a requirement: {self.last_error(output)}")
+                unattributed = pending
+                break
+            logger.info(f"pip batch failed for {', '.join(blamed)}, installing the rest together")
+            failed.update(blamed)
+            pending = [spec for spec in pending if spec not in blamed]
+
+        # Per-package runs only for the failures
+        attempts = [(spec, 1) for spec in unattributed] + [(spec, retries) for spec in failed]
+        for spec, count in attempts:
+            for _ in range(count):
+                returncode, output = self._run([spec], on_line)
+                runs += 1
+                if returncode == 0:
+                    installed.append(spec)
+                    failed.pop(spec, None)
+                    break
+                failed[spec] = self.last_error(output)
+
+        return {'installed': installed, 'failed': failed, 'runs': runs}
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+# File: pips/lockfile.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Fully pinned lockfile with artifact hashes (pipr lock)
+# License: MIT
+
+"""
+lockfile.py
+
+pipr.lock records the outcome of a resolution: one exact version per
+distribution, its requirements and every artifact of that release (file
+name, URL, sha256). Wheels for other platforms are kept too, so the same
+lock installs with --require-hashes on every target.
+
+Re-locking is incremental: locked versions are offered to the resolver
+first together with their recorded requirements, so packages whose
+constraints did not change are kept without asking PyPI about them, and
+artifact lists are only fetched for versions that are new to the lock.
+"""
+
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+try:
+    from .installer import requirement_name  # type: ignore
+except ImportError:
+    from installer import requirement_name  # type: ignore
+
+logger = logging.getLogger('pips')
+
+LOCK_FILE = 'pipr.lock'
+LOCK_VERSION = 1
+
+
+def release_files(project: Optional[Dict[str, Any]], release: Optional[Dict[str, Any]], version: str) -> List[Dict[str, Any]]:
+    """Artifacts of one release from project JSON (releases) or release JSON (urls)"""
+    releases = (project or {}).get('releases') or {}
+    files = releases.get(version)
+    if files is None and releases:
+        # Release keys are not normalized ("1.0" may be listed as "1.0.0")
+        from packaging.version import Version, InvalidVersion
+        for key, value in releases.items():
+            try:
+                if Version(key) == Version(version):
+                    files = value
+                    break
+            except InvalidVersion:
+                continue
+    if not files and release:
+        files = release.get('urls')
+    result = []
+    for f in files or []:
+        sha256 = (f.get('digests') or {}).get('sha256')
+        if not sha256 or f.get('yanked'):
+            continue
+        result.append({
+            'filename': f.get('filename'),
+            'url': f.get('url'),
+            'sha256': sha256,
+            'requires_python': f.get('requires_python'),
+        })
+    return sorted(result, key=lambda f: f['filename'] or '')
+
+
+class Lockfile:
+    """Pinned packages of a requirement set, as written to pipr.lock"""
+
+    def __init__(self, requirements: List[str], python: str, packages: Dict[str, Dict[str, Any]],
+                 created: Optional[float] = None):
+        self.requirements = list(requirements)
+        self.python = python
+        self.packages = packages
+        self.created = created or time.time()
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['Lockfile']:
+        """Parsed lockfile (None if missing, unreadable or of another format version)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Lockfile {path} unreadable: {e}")
+            return None
+        if not isinstance(data, dict) or data.get('version') != LOCK_VERSION:
+            logger.warning(f"Lockfile {path} has an unknown format, it will be rebuilt")
+            return None
+        return cls(data.get('requirements', []), data.get('python', ''), data.get('packages', {}), data.get('created'))
+
+    def save(self, path: Path) -> None:
+        data = {
+            'version': LOCK_VERSION,
+            'created': self.created,
+            'python': self.python,
+            'requirements': self.requirements,
+            'packages': {name: self.packages[name] for name in sorted(self.packages)},
+        }
+        tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    def changed_names(self, requirements: List[str]) -> List[str]:
+        """Canonical names whose direct requirement lines differ from the locked ones"""
+        def by_name(lines):
+            result: Dict[str, set] = {}
+            for line in lines:
+                result.setdefault(requirement_name(line) or line, set()).add(''.join(line.split()))
+            return result
+
+        old, new = by_name(self.requirements), by_name(requirements)
+        return sorted(name for name in set(old) | set(new) if old.get(name) != new.get(name))
+
+    def unhashed(self) -> List[str]:
+        """Pinned packages without any artifact hash (pip's hash-checking mode refuses the whole set)"""
+        return sorted(package['name'] for package in self.packages.values() if not package.get('files'))
+
+    def lines(self, hashes: bool = True) -> List[str]:
+        """pip requirement lines, with every artifact hash when hashes is set"""
+        lines = []
+        for name in sorted(self.packages):
+            package = self.packages[name]
+            extras = f"[{','.join(package['extras'])}]" if package.get('extras') else ""
+            line = f"{package['name']}{extras}=={package['version']}"
+            if hashes:
+                line += "".join(f" --hash=sha256:{f['sha256']}" for f in package.get('files', []))
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def collect_files(pins: Dict[str, str], fetch_project: Callable[[str], Optional[Dict[str, Any]]],
+                      fetch_version: Callable[[str, str], Optional[Dict[str, Any]]],
+                      workers: int = 16) -> Dict[str, List[Dict[str, Any]]]:
+        """One concurrent metadata pass: artifacts of every name==version in pins"""
+        def files_of(name: str, version: str) -> List[Dict[str, Any]]:
+            files = release_files(fetch_project(name), None, version)
+            if not files:
+                files = release_files(None, fetch_version(name, version), version)
+            return files
+
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        if not pins:
+            return result
+        with ThreadPoolExecutor(max_workers=min(workers, len(pins))) as pool:
+            futures = {pool.submit(files_of, name, version): name for name, version in pins.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result[name] = future.result()
+                except Exception as e:
+                    logger.warning(f"Artifacts of {name} unavailable: {e}")
+                    result[name] = []
+        return result
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+# File: pips/mirror.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Incremental selective mirror of an allow-list of packages (pips mirror sync)
+# License: MIT
+
+"""
+mirror.py
+
+Keep a static PEP 503 mirror directory in step with PyPI for a curated set
+of packages:
+
+    <mirror>/simple/<project>/index.html (+ index.json)
+    <mirror>/files/<project>/<filename>
+    <mirror>/sync-state.json
+
+The sync state remembers each project's ETag, last serial and downloaded
+files, so an unchanged project costs one conditional request and nothing
+else. New files are downloaded in parallel and index pages are replaced
+atomically, so the mirror can be served while it is being synced.
+"""
+
+import json
+import time
+import shutil
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from urllib.request import urlopen, Request
+from urllib.error import HTTPError
+
+try:
+    from .simple import canonical_name, project_files, write_project_pages, write_index_pages, write_atomic, file_sha256  # type: ignore
+except ImportError:
+    from simple import canonical_name, project_files, write_project_pages, write_index_pages, write_atomic, file_sha256  # type: ignore
+
+logger = logging.getLogger('pips')
+
+PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
+STATE_VERSION = 1
+
+
+class MirrorSync:
+    """Sync an allow-list of projects from PyPI into a static mirror directory"""
+
+    STATE_NAME = 'sync-state.json'
+
+    def __init__(self, root: Path, downloader_factory: Callable[[str], Any], workers: int = 16,
+                 index_url: str = PYPI_JSON_URL, user_agent: str = 'pips/1.0.0'):
+        """
+        Args:
+            root: Mirror directory
+            downloader_factory: project name -> PackageDownloader saving into root/files/<project>
+            workers: Parallel metadata requests and file downloads
+        """
+        self.root = Path(root)
+        self.simple_dir = self.root / 'simple'
+        self.files_dir = self.root / 'files'
+        self.downloader_factory = downloader_factory
+        self.workers = max(1, workers)
+        self.index_url = index_url
+        self.user_agent = user_agent
+        self.state = self._load_state()
+        self._lock = threading.Lock()
+
+    # State ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.root / self.STATE_NAME, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                return state
+            logger.warning("Mirror sync state has an unknown version, starting a full sync")
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.warning(f"Mirror sync state unreadable ({e}), starting a full sync")
+        return {'version': STATE_VERSION, 'projects': {}}
+
+    def _save_state(self) -> None:
+        with self._lock:
+            data = json.dumps(self.state, indent=1, sort_keys=True).encode('utf-8')
+        write_atomic(self.root / self.STATE_NAME, data)
+
+    # Upstream ---------------------------------------------------------------
+
+    def _fetch_metadata(self, name: str, etag: Optional[str]) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        """Conditional GET of the project JSON, returns (status, data, etag)"""
+        headers = {'User-Agent': self.user_agent, 'Accept': 'application/json'}
+        if etag:
+            headers['If-None-Match'] = etag
+        try:
+            with urlopen(Request(self.index_url.format(name=name), headers=headers), timeout=30) as response:
+                data = json.loads(response.read().decode('utf-8'))
+                serial = response.headers.get('X-PyPI-Last-Serial')
+                if serial and not data.get('last_serial'):
+                    data['last_serial'] = int(serial)
+                return response.status, data, response.headers.get('ETag')
+        except HTTPError as e:
+            if e.code == 304:
+                return 304, None, etag
+            raise
+
+    @staticmethod
+    def _select_files(files: List[Dict[str, Any]], data: Dict[str, Any], spec: Optional[str]) -> List[Dict[str, Any]]:
+        """Keep the files of releases matching the requirement specifier (all releases if none)"""
+        if not spec:
+            return files
+        from packaging.specifiers import SpecifierSet, InvalidSpecifier
+        from packaging.version import Version, InvalidVersion
+
+        try:
+            spec_set = SpecifierSet(spec)
+        except InvalidSpecifier:
+            logger.warning(f"Ignoring invalid specifier '{spec}', mirroring all releases")
+            return files
+
+        wanted = set()
+        for version, release_files in (data.get('releases') or {}).items():
+            try:
+                if Version(version) in spec_set:
+                    wanted.update(f['filename'] for f in release_files)
+            except InvalidVersion:
+                continue
+        return [f for f in files if f['filename'] in wanted]
+
+    # Sync -------------------------------------------------------------------
+
+    def _sync_project(self, name: str, spec: Optional[str], pool: ThreadPoolExecutor) -> Dict[str, Any]:
+        """Bring one project up to date, returns a per-project summary"""
+        project = canonical_name(name)
+        with self._lock:
+            previous = dict(self.state['projects'].get(project, {}))
+        known = previous.get('files', {})
+        project_dir = self.files_dir / project
+        page = self.simple_dir / project / 'index.html'
+
+        unchanged_spec = previous.get('spec') == (spec or '')
+        # A 304 carries no metadata: only ask for one when the page it would keep exists
+        conditional = unchanged_spec and page.is_file()
+        status, data, etag = self._fetch_metadata(project, previous.get('etag') if conditional else None)
+        if status == 304:
+            return {'project': project, 'changed': False, 'downloaded': 0, 'failed': []}
+
+        serial = data.get('last_serial')
+        all_files = project_files(data, self.index_url.format(name=project))
+        files = self._select_files(all_files, data, spec)
+
+        # Same serial, same specifier and every file still on disk: nothing to do
+        if (unchanged_spec and serial and serial == previous.get('serial') and page.is_file()
+                and all((project_dir / f['filename']).is_file() for f in files)):
+            with self._lock:
+                self.state['projects'][project]['etag'] = etag
+            return {'project': project, 'changed': False, 'downloaded': 0, 'failed': []}
+
+        missing = [
+            f for f in files
+            if known.get(f['filename']) != f['hashes'].get('sha256') or not (project_dir / f['filename']).is_file()
+        ]
+
+        downloader = self.downloader_factory(project)
+        futures = {
+            f['filename']: pool.submit(downloader.fetch_file, f['url'], f['filename'], f['hashes'].get('sha256'))
+            for f in missing if not self._reuse_existing(project_dir / f['filename'], f)
+        }
+
+        failed = []
+        for filename, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(filename)
+                logger.warning(f"Mirror download failed for {filename}: {e}")
+
+        present = [f for f in files if f['filename'] not in failed and (project_dir / f['filename']).is_file()]
+        write_project_pages(self.simple_dir, project, present,
+                            lambda f: f"../../files/{project}/{f['filename']}")
+
+        with self._lock:
+            self.state['projects'][project] = {
+                'spec': spec or '',
+                # A partial sync must not be skipped next time
+                'etag': etag if not failed else None,
+                'serial': serial if not failed else None,
+                'files': {f['filename']: f['hashes'].get('sha256') for f in present},
+                'synced': time.time(),
+            }
+        return {'project': project, 'changed': True, 'downloaded': len(futures) - len(failed), 'failed': failed}
+
+    @staticmethod
+    def _reuse_existing(filepath: Path, entry: Dict[str, Any]) -> bool:
+        """A file already on disk (e.g. after a lost state file) is kept if its digest matches"""
+        sha256 = entry['hashes'].get('sha256')
+        if not sha256 or not filepath.is_file():
+            return False
+        return file_sha256(filepath) == sha256
+
+    def sync(self, requirements: List[Tuple[str, Optional[str]]], progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+             prune: bool = False) -> Dict[str, Any]:
+        """
+        Sync every requirement (name, specifier) of the allow-list
+
+        Args:
+            progress: Called with each project summary as it completes
+            prune: Drop projects that are no longer in the allow-list from the index pages
+        """
+        start = time.time()
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+
+        wanted: Dict[str, Optional[str]] = {}
+        for name, spec in requirements:
+            wanted[canonical_name(name)] = spec or None
+
+        results, errors = [], {}
+        # Projects run on one pool, their file downloads on another so neither starves the other
+        with ThreadPoolExecutor(max_workers=self.workers) as project_pool, \
+                ThreadPoolExecutor(max_workers=self.workers) as file_pool:
+            futures = {project_pool.submit(self._sync_project, name, spec, file_pool): name
+                       for name, spec in wanted.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[name] = str(e)
+                    result = {'project': name, 'changed': False, 'downloaded': 0, 'failed': [], 'error': str(e)}
+                    logger.warning(f"Mirror sync failed for {name}: {e}")
+                results.append(result)
+                if progress:
+                    progress(result)
+
+        if prune:
+            with self._lock:
+                removed = [name for name in self.state['projects'] if name not in wanted]
+                for name in removed:
+                    del self.state['projects'][name]
+            for name in removed:
+                shutil.rmtree(self.simple_dir / name, ignore_errors=True)
+                shutil.rmtree(self.files_dir / name, ignore_errors=True)
+                logger.info(f"Mirror pruned {name}")
+
+        changed = [r for r in results if r['changed']]
+        root_page = self.simple_dir / 'index.html'
+        if changed or prune or not root_page.is_file():
+            with self._lock:
+                projects = list(self.state['projects'])
+            write_index_pages(self.simple_dir, projects)
+        self._save_state()
+
+        return {
+            'projects': len(results),
+            'changed': len(changed),
+            'downloaded': sum(r['downloaded'] for r in results),
+            'failed_files': [f for r in results for f in r['failed']],
+            'errors': errors,
+            'elapsed': time.time() - start,
+        }
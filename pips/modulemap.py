@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+# File: pips/modulemap.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Top-level module -> distribution index for pipr import scans
+# License: MIT
+
+"""
+modulemap.py
+
+An import name is not a distribution name: `import jwt` needs PyJWT,
+`import attr` needs attrs, `google` is shared by dozens of projects.
+pipr maps every scanned import through this index instead of guessing:
+
+- installed distributions, from the top-level modules recorded in the
+  installed index (top_level.txt, or the RECORD file list),
+- wheels that are on disk but not installed (pips downloads, the mirror,
+  PIPS_FIND_LINKS, pip's wheel cache), from their top_level.txt / RECORD.
+
+Namespace packages such as `google` are told apart by the packages each
+distribution ships below them (google.protobuf, google.auth, ...), so a
+dotted import is matched on its longest known prefix.
+
+Wheels are read once. Their modules are kept as a compact lookup table
+in ~/.pips/modules.json together with the stat signature of every wheel,
+so later runs only open wheels that are new.
+"""
+
+import os
+import json
+import time
+import zipfile
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+try:
+    from .installed import canonical_name, namespace_modules  # type: ignore
+except ImportError:
+    from installed import canonical_name, namespace_modules  # type: ignore
+
+logger = logging.getLogger('pips')
+
+INDEX_VERSION = 2
+
+
+def get_index_file() -> Path:
+    return Path.home() / '.pips' / 'modules.json'
+
+
+def default_wheel_dirs() -> List[Path]:
+    """Places pips and pip leave wheels in"""
+    dirs = []
+    for value in (os.getenv('PIPS_DOWNLOAD_DIR'), os.getenv('PIPS_MIRROR_DIR') or str(Path.home() / '.pips' / 'mirror')):
+        if value:
+            dirs.append(Path(value).expanduser())
+    dirs += [Path(p).expanduser() for p in (os.getenv('PIPS_FIND_LINKS') or '').split(os.pathsep) if p.strip()]
+    dirs.append(Path.home() / '.cache' / 'pip' / 'wheels')
+    return [d for d in dict.fromkeys(dirs) if d.is_dir()]
+
+
+def modules_from_names(names: Iterable[str]) -> List[str]:
+    """Top-level importable names from RECORD-style archive paths"""
+    modules = set()
+    for name in names:
+        parts = name.split('/')
+        top = parts[0]
+        if not top or top.endswith(('.dist-info', '.data', '.egg-info')) or top in ('..', '__pycache__'):
+            continue
+        if len(parts) == 1:
+            if top.endswith('.py'):
+                modules.add(top[:-3])
+            elif top.endswith(('.so', '.pyd')):
+                modules.add(top.split('.', 1)[0])
+        else:
+            modules.add(top)
+    return sorted(m for m in modules if m.isidentifier())
+
+
+def wheel_modules(path: Path) -> Optional[Tuple[str, List[str]]]:
+    """(distribution name, top-level modules + dotted namespace packages) of a wheel, None if it cannot be read"""
+    distribution = Path(path).name.split('-', 1)[0].replace('_', '-')
+    try:
+        with zipfile.ZipFile(path) as zf:
+            names = zf.namelist()
+            top_level = next((n for n in names if n.endswith('.dist-info/top_level.txt') and n.count('/') == 1), None)
+            if top_level:
+                text = zf.read(top_level).decode('utf-8', errors='replace')
+                modules = sorted({line.strip().split('/')[0] for line in text.splitlines() if line.strip()})
+            else:
+                modules = modules_from_names(names)
+            modules += namespace_modules(names)
+    except (OSError, zipfile.BadZipFile, KeyError) as e:
+        logger.debug(f"Cannot read modules of {path}: {e}")
+        return None
+    return distribution, modules
+
+
+class ModuleIndex:
+    """Which distributions provide a top-level module, installed or downloaded"""
+
+    def __init__(self, installed, wheel_dirs: Optional[List[Path]] = None, index_file: Optional[Path] = None):
+        """
+        Args:
+            installed: InstalledIndex of the environment being scanned for
+            wheel_dirs: Directories searched for wheels (default: default_wheel_dirs())
+            index_file: Persisted wheel table (default: ~/.pips/modules.json)
+        """
+        self.installed = installed
+        self.wheel_dirs = default_wheel_dirs() if wheel_dirs is None else [Path(d) for d in wheel_dirs]
+        self.index_file = Path(index_file or get_index_file())
+        # wheel path -> [mtime_ns, size, distribution, modules]
+        self.wheels: Dict[str, List[Any]] = {}
+        self.modules: Dict[str, List[str]] = {}
+        self._installed_modules: Optional[Dict[str, List[str]]] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.wheels = data['wheels']
+                self.modules = data['modules']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save(self) -> None:
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_name(f".{self.index_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'wheels': self.wheels, 'modules': self.modules},
+                          f, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.debug(f"Cannot save module index: {e}")
+
+    def refresh(self) -> 'ModuleIndex':
+        """Read wheels that are new or changed, forget the ones that are gone"""
+        start = time.time()
+        found: Dict[str, List[int]] = {}
+        for directory in self.wheel_dirs:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'simple']
+                for filename in filenames:
+                    if filename.endswith('.whl') and not filename.startswith('.'):
+                        path = os.path.join(dirpath, filename)
+                        try:
+                            st = os.stat(path)
+                        except OSError:
+                            continue
+                        found[path] = [st.st_mtime_ns, st.st_size]
+
+        changed = False
+        for path, stamp in found.items():
+            known = self.wheels.get(path)
+            if known and known[:2] == stamp:
+                continue
+            result = wheel_modules(Path(path))
+            self.wheels[path] = stamp + (list(result) if result else ['', []])
+            changed = True
+        for path in [p for p in self.wheels if p not in found]:
+            del self.wheels[path]
+            changed = True
+
+        if changed or not self.modules and self.wheels:
+            table: Dict[str, set] = {}
+            for _, _, distribution, modules in self.wheels.values():
+                for module in modules:
+                    if distribution:
+                        table.setdefault(module, set()).add(distribution)
+            self.modules = {module: sorted(dists, key=canonical_name) for module, dists in table.items()}
+            self.save()
+        logger.debug(f"Module index: {len(self.wheels)} wheels, {len(self.modules)} modules in {time.time() - start:.3f}s")
+        return self
+
+    def distributions(self, module: str) -> List[str]:
+        """
+        Distributions providing `import module`, matched on the longest dotted prefix
+
+        `google.protobuf.json_format` matches the distributions that ship
+        google/protobuf/ before the ones that merely share the `google`
+        namespace. At each prefix installed distributions win over wheels.
+        """
+        if self._installed_modules is None:
+            self._installed_modules = {}
+            for dist in self.installed.dists.values():
+                for name in list(dist.get('top_level', ())) + list(dist.get('namespaces', ())):
+                    self._installed_modules.setdefault(name, []).append(dist['name'])
+        parts = module.split('.')
+        for depth in range(len(parts), 0, -1):
+            prefix = '.'.join(parts[:depth])
+            installed = self._installed_modules.get(prefix)
+            if installed:
+                return sorted(set(installed), key=canonical_name)
+            # Several wheels of one project are listed under one name
+            seen, result = set(), []
+            for distribution in self.modules.get(prefix, []):
+                if canonical_name(distribution) not in seen:
+                    seen.add(canonical_name(distribution))
+                    result.append(distribution)
+            if result:
+                return result
+        return []
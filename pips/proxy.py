@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+
+# File: pips/proxy.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Lazy caching PyPI proxy (pips proxy) serving PEP 503/691 pages and package files
+# License: MIT
+
+"""
+proxy.py
+
+`pips proxy` answers `pip install --index-url http://host:port/simple/`.
+Project pages are rendered from PyPIClient metadata (so they go through the
+daemon/Redis/file cache tiers), package files are fetched from upstream on
+the first request and served from local disk afterwards. While a file is
+still downloading, every client asking for it is streamed the bytes already
+on disk instead of waiting for (or repeating) the upstream download.
+"""
+
+import os
+import shutil
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+from urllib.parse import unquote
+
+try:
+    from .simple import canonical_name, project_files, negotiate, render_index, render_project, JSON_TYPE  # type: ignore
+except ImportError:
+    from simple import canonical_name, project_files, negotiate, render_index, render_project, JSON_TYPE  # type: ignore
+
+logger = logging.getLogger('pips')
+
+CHUNK_SIZE = 65536
+
+
+class InFlight:
+    """An upstream download that concurrent readers can follow"""
+
+    def __init__(self, tmp_path: Path, final_path: Path, size: Optional[int] = None):
+        self.tmp_path = tmp_path
+        self.final_path = final_path
+        self.size = size
+        self.written = 0
+        self.done = False
+        self.error: Optional[str] = None
+        self.cond = threading.Condition()
+
+    def advance(self, nbytes: int) -> None:
+        with self.cond:
+            self.written += nbytes
+            self.cond.notify_all()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+
+class PipsProxy:
+    """Caching proxy state: metadata lookups, file store, in-flight downloads and disk quota"""
+
+    def __init__(self, client, downloader_factory: Callable[[str], Any], root: Path, max_size: int = 0):
+        """
+        Args:
+            client: PyPIClient used for project metadata
+            downloader_factory: project name -> PackageDownloader saving into root/files/<project>
+            root: Proxy storage directory
+            max_size: Disk quota for package files in bytes (0 = unlimited)
+        """
+        self.client = client
+        self.downloader_factory = downloader_factory
+        self.root = Path(root)
+        self.files_dir = self.root / 'files'
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._inflight: Dict[str, InFlight] = {}
+        self._lock = threading.Lock()
+        self._known_files: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._clean_partials()
+
+    def _clean_partials(self) -> None:
+        """Remove temporary files left behind by an interrupted proxy"""
+        for partial in self.files_dir.glob('*/.part-*'):
+            partial.unlink(missing_ok=True)
+
+    # Metadata ---------------------------------------------------------------
+
+    def project_files(self, project: str) -> Dict[str, Dict[str, Any]]:
+        """filename -> file entry for a project, from metadata or (offline) the local store"""
+        project = canonical_name(project)
+        try:
+            data = self.client.get_package_info(project)
+            base_url = f"{self.client.PYPI_BASE_URL}/{project}/json"
+            files = {f['filename']: f for f in project_files(data, base_url)}
+        except Exception as e:
+            local_dir = self.files_dir / project
+            if not local_dir.is_dir():
+                raise
+            logger.warning(f"Upstream metadata for {project} unavailable ({e}), serving local files only")
+            files = {
+                path.name: {'filename': path.name, 'url': None, 'hashes': {}, 'requires_python': None, 'yanked': False}
+                for path in local_dir.iterdir() if path.is_file() and not path.name.startswith('.')
+            }
+        with self._lock:
+            self._known_files[project] = files
+        return files
+
+    def index_page(self, accept: Optional[str]) -> tuple:
+        content_type = negotiate(accept)
+        projects = {p.name for p in self.files_dir.iterdir() if p.is_dir()} | set(self._known_files)
+        return content_type, render_index(projects, content_type)
+
+    def project_page(self, project: str, accept: Optional[str]) -> tuple:
+        content_type = negotiate(accept)
+        name = canonical_name(project)
+        files = sorted(self.project_files(name).values(), key=lambda f: f['filename'])
+        body = render_project(name, files, lambda f: f"/files/{name}/{f['filename']}", content_type)
+        return content_type, body
+
+    # Files ------------------------------------------------------------------
+
+    def file_entry(self, project: str, filename: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._known_files.get(project, {}).get(filename)
+        if entry is None:
+            entry = self.project_files(project).get(filename)
+        return entry
+
+    def open_file(self, project: str, filename: str):
+        """
+        Locate a package file, starting the upstream download on a miss
+
+        Returns:
+            (Path, None) for a complete local file or (None, InFlight) for a download in progress
+        """
+        project = canonical_name(project)
+        final_path = self.files_dir / project / filename
+        if final_path.is_file():
+            os.utime(final_path)  # Recently used files survive quota eviction
+            return final_path, None
+
+        with self._lock:
+            inflight = self._inflight.get(str(final_path))
+            if inflight:
+                return None, inflight
+
+        entry = self.file_entry(project, filename)
+        if not entry or not entry.get('url'):
+            raise FileNotFoundError(f"{project}/{filename}")
+
+        with self._lock:
+            # Another request may have started it while metadata was loading
+            inflight = self._inflight.get(str(final_path))
+            if inflight:
+                return None, inflight
+            downloader = self.downloader_factory(project)
+            inflight = InFlight(downloader.partial_path(filename), final_path, entry.get('size'))
+            self._inflight[str(final_path)] = inflight
+
+        threading.Thread(target=self._download, args=(downloader, entry, inflight), daemon=True).start()
+        return None, inflight
+
+    def _download(self, downloader, entry: Dict[str, Any], inflight: InFlight) -> None:
+        error = None
+        try:
+            downloader.fetch_file(
+                entry['url'],
+                entry['filename'],
+                sha256=entry['hashes'].get('sha256'),
+                on_chunk=inflight.advance,
+                tmp_path=inflight.tmp_path
+            )
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Proxy download failed for {entry['filename']}: {e}")
+        finally:
+            inflight.finish(error)
+            with self._lock:
+                self._inflight.pop(str(inflight.final_path), None)
+        if not error:
+            self.enforce_quota()
+
+    def stream(self, inflight: InFlight, write: Callable[[bytes], Any]) -> None:
+        """Copy a download to a client while it is still being written"""
+        with inflight.cond:
+            inflight.cond.wait_for(lambda: inflight.written > 0 or inflight.done)
+            if inflight.error:
+                raise IOError(inflight.error)
+
+        try:
+            f = open(inflight.tmp_path, 'rb')
+        except FileNotFoundError:
+            # Finished (renamed) between the check and the open
+            f = open(inflight.final_path, 'rb')
+
+        sent = 0
+        with f:
+            while True:
+                with inflight.cond:
+                    inflight.cond.wait_for(lambda: inflight.written > sent or inflight.done, timeout=30)
+                    available, done, error = inflight.written - sent, inflight.done, inflight.error
+                if error:
+                    raise IOError(error)
+                if available > 0:
+                    chunk = f.read(min(available, CHUNK_SIZE))
+                    write(chunk)
+                    sent += len(chunk)
+                elif done:
+                    break
+
+    def enforce_quota(self) -> None:
+        """Evict least recently used package files until the store fits the quota"""
+        if not self.max_size:
+            return
+        files = [p for p in self.files_dir.glob('*/*') if p.is_file() and not p.name.startswith('.')]
+        stats = {p: p.stat() for p in files}
+        total = sum(st.st_size for st in stats.values())
+        if total <= self.max_size:
+            return
+        for path in sorted(files, key=lambda p: stats[p].st_mtime):
+            path.unlink(missing_ok=True)
+            total -= stats[path].st_size
+            logger.info(f"Proxy quota: evicted {path.name}")
+            if total <= self.max_size:
+                break
+
+    def usage(self) -> int:
+        return sum(p.stat().st_size for p in self.files_dir.glob('*/*') if p.is_file())
+
+    # HTTP -------------------------------------------------------------------
+
+    def serve(self, host: str = '127.0.0.1', port: int = 3141) -> None:
+        """Serve until interrupted (blocking)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            server_version = "pips-proxy"
+
+            def log_message(self, format, *args):
+                logger.info(f"{self.address_string()} {format % args}")
+
+            def send_body(self, content_type: str, body: bytes) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', content_type if content_type == JSON_TYPE else f"{content_type}; charset=utf-8")
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Vary', 'Accept')
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                path = unquote(self.path.split('?', 1)[0])
+                parts = [p for p in path.split('/') if p]
+                try:
+                    if parts == ['simple']:
+                        if not path.endswith('/'):
+                            return self.redirect('/simple/')
+                        return self.send_body(*proxy.index_page(self.headers.get('Accept')))
+
+                    if len(parts) == 2 and parts[0] == 'simple':
+                        name = canonical_name(parts[1])
+                        if parts[1] != name or not path.endswith('/'):
+                            return self.redirect(f"/simple/{name}/")
+                        return self.send_body(*proxy.project_page(name, self.headers.get('Accept')))
+
+                    if len(parts) == 3 and parts[0] == 'files' and not parts[2].startswith('.'):
+                        return self.send_file(parts[1], parts[2])
+
+                    self.send_error(404)
+                except FileNotFoundError:
+                    self.send_error(404)
+                except Exception as e:
+                    logger.warning(f"Proxy error for {path}: {e}")
+                    if 'not found' in str(e).lower():
+                        self.send_error(404)
+                    else:
+                        self.send_error(502, str(e)[:200])
+
+            def redirect(self, location: str) -> None:
+                self.send_response(301)
+                self.send_header('Location', location)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def send_file(self, project: str, filename: str) -> None:
+                filepath, inflight = proxy.open_file(project, filename)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                size = filepath.stat().st_size if filepath else inflight.size
+                if size:
+                    self.send_header('Content-Length', str(size))
+                self.end_headers()
+                if self.command == 'HEAD':
+                    return
+                try:
+                    if filepath:
+                        with open(filepath, 'rb') as f:
+                            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+                    else:
+                        proxy.stream(inflight, self.wfile.write)
+                except Exception as e:
+                    # The 200 is already sent, an error page would land in the file body;
+                    # closing the connection leaves the client a truncated download instead
+                    logger.warning(f"Proxy transfer of {project}/{filename} failed: {e}")
+                    self.close_connection = True
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        logger.info(f"pips proxy listening on http://{host}:{port}/simple/")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like 500M, 20G or 1048576 into bytes"""
+    value = str(value).strip().upper().rstrip('B')
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value or 0)
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+
+# File: pips/resolver.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Transitive dependency resolver with backtracking over PyPI metadata (pipr tidy)
+# License: MIT
+
+"""
+resolver.py
+
+Resolve a requirement set to one version per distribution, following
+requires_dist transitively, the way pip's resolver would, but from the
+JSON metadata pips and pipr already cache.
+
+- Markers are evaluated for the running interpreter, including extras.
+- Candidates are tried newest first. A dead end backjumps to the most
+  recent decision that contributed to it, not just the previous one.
+- Project metadata for every newly discovered name is prefetched
+  concurrently while the resolver works on the current one.
+- When no solution exists, the conflict is reduced to a minimal set of
+  requirements that together exclude every version.
+"""
+
+import re
+import sys
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, List, Tuple, Set, Callable, Iterable
+
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
+from packaging.version import Version, InvalidVersion
+from packaging.markers import default_environment
+
+logger = logging.getLogger('pips')
+
+ROOT = None  # Parent of the requirements given by the user
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized distribution name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class ResolutionError(Exception):
+    """No consistent set of versions exists (or none was found in time)"""
+
+    def __init__(self, message: str, name: Optional[str] = None,
+                 causes: Optional[List[Tuple[str, Optional[str]]]] = None):
+        super().__init__(message)
+        self.name = name
+        self.causes = causes or []
+
+
+class ResolutionTooDeep(ResolutionError):
+    """The search gave up after too many attempts"""
+
+
+class PyPIProvider:
+    """Candidate versions and dependencies from PyPI JSON metadata"""
+
+    def __init__(self, fetch_project: Callable[[str], Optional[Dict[str, Any]]],
+                 fetch_version: Callable[[str, str], Optional[Dict[str, Any]]],
+                 python_version: Optional[str] = None, workers: int = 16):
+        """
+        Args:
+            fetch_project: name -> /pypi/<name>/json data (None if unknown)
+            fetch_version: name, version -> /pypi/<name>/<version>/json data (None if unavailable)
+            python_version: Interpreter version to resolve for (default: the running one)
+        """
+        self.fetch_project = fetch_project
+        self.fetch_version = fetch_version
+        self.python_version = Version(python_version or '.'.join(str(v) for v in sys.version_info[:3]))
+        self.environment = default_environment()
+        if python_version:
+            self.environment['python_version'] = '.'.join(python_version.split('.')[:2])
+            self.environment['python_full_version'] = python_version
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._projects: Dict[str, Future] = {}
+        self._candidates: Dict[str, List[Version]] = {}
+        self._dependencies: Dict[Tuple[str, str], Optional[List[str]]] = {}
+        self._lock = threading.Lock()
+        self.unknown: Set[str] = set()
+        self.preferred: Dict[str, Version] = {}
+        self.names: Dict[str, str] = {}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    # Metadata ---------------------------------------------------------------
+
+    def prefer(self, name: str, version: str, requires: Optional[List[str]] = None,
+               display_name: Optional[str] = None) -> None:
+        """
+        Try version first for name (e.g. from a lockfile)
+
+        With its requires known as well, a preferred version that still fits
+        never causes a metadata request for that project.
+        """
+        name = canonical_name(name)
+        self.preferred[name] = Version(version)
+        if requires is not None:
+            self._dependencies[(name, str(self.preferred[name]))] = list(requires)
+        if display_name:
+            self.names[name] = display_name
+
+    def requires(self, name: str, version: Version) -> List[str]:
+        """Raw requires_dist of a release the resolver has looked at"""
+        return list(self._dependencies.get((name, str(version))) or [])
+
+    def _submit(self, name: str) -> None:
+        with self._lock:
+            if name not in self._projects:
+                self._projects[name] = self._executor.submit(self.fetch_project, name)
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        """Start fetching project metadata in the background (not for preferred names)"""
+        for name in names:
+            if name not in self.preferred:
+                self._submit(name)
+
+    def project(self, name: str) -> Optional[Dict[str, Any]]:
+        self._submit(name)
+        try:
+            return self._projects[name].result()
+        except Exception as e:
+            logger.warning(f"Metadata for {name} unavailable: {e}")
+            return None
+
+    def display_name(self, name: str) -> str:
+        if name in self.names:
+            return self.names[name]
+        data = self.project(name)
+        return (data or {}).get('info', {}).get('name') or name
+
+    def candidates(self, name: str) -> List[Version]:
+        """Installable versions for the target Python, newest first"""
+        if name in self._candidates:
+            return self._candidates[name]
+
+        data = self.project(name) or {}
+        versions = []
+        for raw, files in (data.get('releases') or {}).items():
+            files = [f for f in files or [] if not f.get('yanked')]
+            if not files:
+                continue
+            try:
+                candidate = Version(raw)
+            except InvalidVersion:
+                continue
+            requires_python = next((f['requires_python'] for f in files if f.get('requires_python')), None)
+            if requires_python:
+                try:
+                    if not SpecifierSet(requires_python).contains(self.python_version, prereleases=True):
+                        continue
+                except InvalidSpecifier:
+                    pass
+            versions.append(candidate)
+
+        versions.sort(reverse=True)
+        self._candidates[name] = versions
+        return versions
+
+    def dependencies(self, name: str, version: Version, extras: Set[str]) -> List[Requirement]:
+        """Requirements of name==version that apply here with the given extras"""
+        key = (name, str(version))
+        if key not in self._dependencies:
+            data = self.project(name) or {}
+            info = data.get('info') or {}
+            if info.get('version') and Version(info['version']) == version:
+                requires = info.get('requires_dist')
+            else:
+                release = self.fetch_version(name, str(version))
+                requires = (release or {}).get('info', {}).get('requires_dist') if release else None
+                if release is None:
+                    # Resolution continues as if it had none, the report lists it
+                    self.unknown.add(f"{self.display_name(name)}=={version}")
+            self._dependencies[key] = list(requires or [])
+
+        result = []
+        for line in self._dependencies[key]:
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                logger.debug(f"Ignoring invalid requirement of {name} {version}: {line}")
+                continue
+            if self.marker_applies(requirement, extras):
+                result.append(requirement)
+        return result
+
+    def marker_applies(self, requirement: Requirement, extras: Set[str]) -> bool:
+        if not requirement.marker:
+            return True
+        for extra in (extras or set()) | {''}:
+            if requirement.marker.evaluate({**self.environment, 'extra': extra}):
+                return True
+        return False
+
+
+class Resolution:
+    """A consistent set of pins plus who asked for each of them"""
+
+    def __init__(self, pins: Dict[str, Version], parents: Dict[str, Set[Optional[str]]],
+                 extras: Dict[str, Set[str]], names: Dict[str, str], unknown: Set[str], rounds: int):
+        self.pins = pins
+        self.parents = parents
+        self.extras = extras
+        self.names = names
+        self.unknown = unknown
+        self.rounds = rounds
+
+    def lines(self) -> List[str]:
+        """name==version lines in alphabetical order"""
+        lines = []
+        for name in sorted(self.pins):
+            extras = f"[{','.join(sorted(self.extras[name]))}]" if self.extras.get(name) else ""
+            lines.append(f"{self.names.get(name, name)}{extras}=={self.pins[name]}")
+        return lines
+
+    def required_by(self, name: str) -> List[str]:
+        return sorted(self.names.get(p, p) for p in self.parents.get(name, set()) if p)
+
+
+class _State:
+    """Resolver state at one decision level (copied, never mutated once a child level exists)"""
+
+    __slots__ = ('constraints', 'pins', 'extras', 'applied')
+
+    def __init__(self):
+        self.constraints: Dict[str, Tuple[Tuple[Requirement, Optional[str]], ...]] = {}
+        self.pins: Dict[str, Version] = {}
+        self.extras: Dict[str, frozenset] = {}
+        self.applied: Dict[str, frozenset] = {}
+
+    def copy(self) -> '_State':
+        state = _State()
+        state.constraints = dict(self.constraints)
+        state.pins = dict(self.pins)
+        state.extras = dict(self.extras)
+        state.applied = dict(self.applied)
+        return state
+
+
+class Resolver:
+    """Backtracking resolver with conflict-directed backjumping"""
+
+    def __init__(self, provider: PyPIProvider, max_rounds: int = 20000):
+        self.provider = provider
+        self.max_rounds = max_rounds
+        self.rounds = 0
+        self.failures: Dict[Tuple[str, Tuple[str, ...]], List[Any]] = {}
+
+    # Helpers ----------------------------------------------------------------
+
+    @staticmethod
+    def _allows(requirement: Requirement, candidate: Version) -> bool:
+        # Pre-releases only when a specifier names one, like pip
+        return requirement.specifier.contains(candidate)
+
+    def _matching(self, name: str, constraints: Iterable[Tuple[Requirement, Optional[str]]]) -> List[Version]:
+        constraints = list(constraints)
+        return [v for v in self.provider.candidates(name) if all(self._allows(r, v) for r, _ in constraints)]
+
+    def _ordered(self, name: str, constraints: List[Tuple[Requirement, Optional[str]]]) -> Iterable[Version]:
+        """Matching candidates, a preferred version first (the others are only listed if it fails)"""
+        preferred = self.provider.preferred.get(name)
+        if preferred is not None and all(self._allows(r, preferred) for r, _ in constraints):
+            yield preferred
+        for candidate in self._matching(name, constraints):
+            if candidate != preferred:
+                yield candidate
+
+    def _record(self, name: str, constraints: List[Tuple[Requirement, Optional[str]]]) -> None:
+        key = (name, tuple(sorted(f"{p}:{r}" for r, p in constraints)))
+        entry = self.failures.setdefault(key, [0, name, constraints])
+        entry[0] += 1
+
+    def _add(self, state: _State, parent: Optional[str], requirements: List[Requirement]) -> Optional[Set[Optional[str]]]:
+        """
+        Add requirements (and extras of already pinned names) to state in place
+
+        Returns:
+            None on success, otherwise the decisions responsible for the conflict
+        """
+        work = [(parent, r) for r in requirements]
+        while work:
+            owner, requirement = work.pop(0)
+            name = canonical_name(requirement.name)
+            state.constraints[name] = state.constraints.get(name, ()) + ((requirement, owner),)
+            if requirement.extras:
+                state.extras[name] = state.extras.get(name, frozenset()) | frozenset(requirement.extras)
+
+            pin = state.pins.get(name)
+            if pin is None:
+                continue
+            if not self._allows(requirement, pin):
+                self._record(name, list(state.constraints[name]))
+                return {owner, name} | {p for _, p in state.constraints[name]}
+
+            # New extras of a pinned distribution bring in more requirements
+            missing = state.extras.get(name, frozenset()) - state.applied.get(name, frozenset())
+            if missing:
+                state.applied[name] = state.applied.get(name, frozenset()) | missing
+                base = {str(r) for r in self.provider.dependencies(name, pin, set())}
+                extra_requirements = [r for r in self.provider.dependencies(name, pin, set(missing)) if str(r) not in base]
+                work.extend((name, r) for r in extra_requirements)
+                self.provider.prefetch(canonical_name(r.name) for r in extra_requirements)
+        return None
+
+    # Search -----------------------------------------------------------------
+
+    def _next(self, state: _State) -> Optional[str]:
+        """Next undecided name: exact pins first, then in discovery order"""
+        undecided = [name for name in state.constraints if name not in state.pins]
+        if not undecided:
+            return None
+        for name in undecided:
+            if any(any(s.operator in ('==', '===') and '*' not in s.version for s in r.specifier)
+                   for r, _ in state.constraints[name]):
+                return name
+        return undecided[0]
+
+    def _solve(self, state: _State) -> Tuple[Optional[_State], Set[Optional[str]]]:
+        name = self._next(state)
+        if name is None:
+            return state, set()
+
+        constraints = list(state.constraints[name])
+        responsible = {p for _, p in constraints}
+
+        conflict: Set[Optional[str]] = set()
+        tried = False
+        for candidate in self._ordered(name, constraints):
+            tried = True
+            self.rounds += 1
+            if self.rounds > self.max_rounds:
+                raise ResolutionTooDeep(f"Gave up after {self.max_rounds} attempts")
+
+            child = state.copy()
+            child.pins[name] = candidate
+            child.applied[name] = state.extras.get(name, frozenset())
+            requirements = self.provider.dependencies(name, candidate, set(child.applied[name]))
+            self.provider.prefetch(canonical_name(r.name) for r in requirements)
+
+            failed = self._add(child, name, requirements)
+            if failed is None:
+                result, failed = self._solve(child)
+                if result is not None:
+                    return result, set()
+
+            if name not in failed:
+                # This choice had nothing to do with the dead end: backjump past it
+                return None, failed
+            conflict |= failed - {name}
+
+        if not tried:
+            self._record(name, constraints)
+        return None, conflict | responsible
+
+    def resolve(self, requirements: List[str]) -> Resolution:
+        """
+        Resolve requirement strings (name[extras] specifier ; marker)
+
+        Raises:
+            ResolutionError: With the minimal conflicting requirements in .causes
+        """
+        roots = []
+        for line in requirements:
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement as e:
+                raise ResolutionError(f"Invalid requirement '{line}': {e}")
+            if self.provider.marker_applies(requirement, set()):
+                roots.append(requirement)
+
+        self.provider.prefetch(canonical_name(r.name) for r in roots)
+        state = _State()
+        self._add(state, ROOT, roots)
+
+        old_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(old_limit, 10000))
+        try:
+            result, _ = self._solve(state)
+        except ResolutionTooDeep as e:
+            raise self._explain(type(e), str(e))
+        finally:
+            sys.setrecursionlimit(old_limit)
+
+        if result is None:
+            raise self._explain(ResolutionError, "No consistent set of versions exists")
+
+        parents: Dict[str, Set[Optional[str]]] = {}
+        for name, constraints in result.constraints.items():
+            parents[name] = {p for _, p in constraints}
+        names = {name: self.provider.display_name(name) for name in result.pins}
+        return Resolution(result.pins, parents, {n: set(e) for n, e in result.extras.items()},
+                          names, set(self.provider.unknown), self.rounds)
+
+    # Explanation ------------------------------------------------------------
+
+    def _explain(self, error_type, message: str) -> ResolutionError:
+        """Most frequent dead end, reduced to the requirements that cannot hold together"""
+        if not self.failures:
+            return error_type(message)
+        _, name, constraints = max(self.failures.values(), key=lambda entry: entry[0])
+
+        minimal = list(constraints)
+        # Without any release every requirement on the name is a cause, there is nothing to reduce
+        if self.provider.candidates(name):
+            for item in list(constraints):
+                trial = [c for c in minimal if c is not item]
+                if not self._matching(name, trial):
+                    minimal = trial
+
+        causes = [(str(r), p) for r, p in minimal]
+        display = self.provider.display_name(name)
+        if self.provider.project(name) is None:
+            detail = f"{display} was not found on PyPI"
+        elif not self.provider.candidates(name):
+            detail = f"no installable release of {display} for Python {self.provider.python_version}"
+        else:
+            detail = f"no release of {display} satisfies " + " and ".join(
+                f"{r} (from {self.provider.display_name(p) if p else 'your requirements'})" for r, p in causes
+            )
+        return error_type(f"{message}: {detail}", name, causes)
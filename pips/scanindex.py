@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# File: pips/scanindex.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Persistent per-directory index of the imports of every Python file
+# License: MIT
+
+"""
+scanindex.py
+
+`pipr <directory>` needs the imports of every .py file below it. The index
+remembers, per file, its stat signature (mtime, size, inode) and import
+list, so a re-scan only stats the tree and reads the files that changed.
+
+One compact JSON file per scanned directory and extractor is kept under
+~/.pips/scan/, instead of one cache entry per source file.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Set, Callable, Iterable
+
+try:
+    from .scanner import scan_files, EXTRACTOR_VERSION  # type: ignore
+except ImportError:
+    from scanner import scan_files, EXTRACTOR_VERSION  # type: ignore
+
+logger = logging.getLogger('pips')
+
+INDEX_VERSION = 2
+
+
+def get_index_dir() -> Path:
+    return Path.home() / '.pips' / 'scan'
+
+
+def signature(st: os.stat_result) -> List[int]:
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+class ScanIndex:
+    """Imports of the Python files under one directory, refreshed by stat signature"""
+
+    def __init__(self, root: Path, mode: str = 'fast', index_dir: Optional[Path] = None):
+        """
+        Args:
+            root: Scanned directory (paths are stored relative to it)
+            mode: Extractor the imports were found with, see scanner.MODES
+            index_dir: Where index files live (default: ~/.pips/scan)
+        """
+        self.root = Path(os.path.abspath(root))
+        self.mode = mode
+        key = hashlib.sha256(f"{self.root}\0{mode}".encode('utf-8')).hexdigest()[:16]
+        self.index_file = Path(index_dir or get_index_dir()) / f"{key}.json"
+        # relpath -> [mtime_ns, size, inode, imports]
+        self.files: Dict[str, List[Any]] = self._load()
+
+    def _load(self) -> Dict[str, List[Any]]:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get('version') == INDEX_VERSION and data.get('extractor') == EXTRACTOR_VERSION
+                    and data.get('root') == str(self.root) and data.get('mode') == self.mode):
+                return data['files']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def save(self) -> None:
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_name(f".{self.index_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'extractor': EXTRACTOR_VERSION, 'root': str(self.root), 'mode': self.mode, 'files': self.files},
+                          f, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logger.debug(f"Cannot save scan index: {e}")
+
+    def update(self, paths: Iterable[Path], jobs: int = 1, recursive: bool = True,
+               on_error: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Imports of paths, reading only files that are new or whose signature changed
+
+        Args:
+            paths: Python files below the root (the complete listing of this scan)
+            jobs: Worker processes for the files that need parsing
+            recursive: Whether paths covers subdirectories (entries there are kept otherwise)
+            on_error: Called with (path, error) for files that could not be read
+
+        Returns:
+            dict: imports (set), paths (set of scanned relpaths), files, parsed, removed, elapsed
+        """
+        start = time.time()
+        imports: Set[str] = set()
+        seen = set()
+        stale: Dict[str, List[int]] = {}
+
+        def changed() -> Iterable[str]:
+            """Files that need parsing, handed over while paths is still being walked"""
+            for path in paths:
+                path = os.path.abspath(path)
+                try:
+                    relpath = Path(path).relative_to(self.root).as_posix()
+                    st = os.stat(path)
+                except (ValueError, OSError):
+                    continue
+                seen.add(relpath)
+                known = self.files.get(relpath)
+                if known and known[:3] == signature(st):
+                    imports.update(known[3])
+                else:
+                    stale[path] = signature(st)
+                    yield path
+
+        def on_result(result):
+            path, found, error = result
+            if error is not None and on_error:
+                on_error(path, error)
+            relpath = Path(path).relative_to(self.root).as_posix()
+            self.files[relpath] = stale[path] + [found or []]
+            imports.update(found or [])
+
+        scan_files(changed(), jobs=jobs, on_result=on_result, mode=self.mode)
+
+        # Files that disappeared from the scanned part of the tree
+        removed = [relpath for relpath in self.files
+                   if relpath not in seen and (recursive or '/' not in relpath)]
+        for relpath in removed:
+            del self.files[relpath]
+        if stale or removed:
+            self.save()
+
+        return {
+            'imports': imports,
+            'paths': seen,
+            'files': len(seen),
+            'parsed': len(stale),
+            'removed': len(removed),
+            'elapsed': time.time() - start,
+        }
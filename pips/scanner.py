@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# File: pips/scanner.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Import extraction for pipr, serial or across a process pool
+# License: MIT
+
+"""
+scanner.py
+
+Finds the modules a Python file imports, as dotted paths (google.protobuf,
+os.path) so namespace packages can be told apart. Large trees are split
+into chunks and parsed by a pool of processes, each chunk returning the
+imports of its files so the caller can cache them per file and merge them
+into one set.
+
+Three extractors are available:
+
+- fast (default): a regex pass over the source that only looks at import
+  statements (string literals and comments removed first). No AST is built, and
+  files with syntax errors still yield their imports.
+- top: like fast, but stops where the module header ends (the first
+  top-level def, class, decorator or `if __name__`), so imports made
+  inside functions are not seen.
+- ast: full ast.parse of the file; on a syntax error it falls back to fast.
+
+This module only imports the standard library so pool workers start fast
+on platforms that spawn instead of fork.
+"""
+
+import io
+import os
+import re
+import ast
+import itertools
+import tokenize
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, List, Tuple, Set, Callable, Iterable
+
+# Below this many files a pool costs more to start than it saves
+MIN_POOL_FILES = 200
+# Files per pool task: enough to amortize the task overhead, few enough to balance workers
+CHUNK_SIZE = 64
+
+ScanResult = Tuple[str, Optional[List[str]], Optional[str]]
+
+MODES = ('fast', 'top', 'ast')
+# Bumped whenever an extractor finds different imports, so cached results are redone
+EXTRACTOR_VERSION = 3
+# String literals and comments, matched left to right so quotes inside comments
+# (and comment signs inside strings) do not confuse the scan
+STRINGS_AND_COMMENTS = re.compile(
+    r'''(?s)\'\'\'.*?\'\'\'|""".*?"""|'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|\#[^\n]*'''
+)
+# An import starts a line or follows `;` or a compound statement's colon (`try: import x`)
+IMPORT_STATEMENT = re.compile(
+    r'(?:^|[;:])[ \t]*(?:from[ \t]+(\.*)([\w.]*)[ \t]+import\b|import[ \t]+((?:[^\n;#\\]|\\\n)+))',
+    re.MULTILINE
+)
+HEADER_END = re.compile(r'^(?:def |class |async |@|if __name__)', re.MULTILINE)
+
+
+def default_jobs() -> int:
+    """Worker processes for scanning: PIPS_SCAN_JOBS or the CPU count"""
+    value = os.getenv('PIPS_SCAN_JOBS') or ''
+    try:
+        return max(1, int(value)) if value else (os.cpu_count() or 1)
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def default_mode() -> str:
+    """Extractor used unless one is given: PIPS_SCAN_MODE or fast"""
+    mode = (os.getenv('PIPS_SCAN_MODE') or '').lower()
+    return mode if mode in MODES else 'fast'
+
+
+def decode_source(data: bytes) -> str:
+    """Source text honoring a PEP 263 coding cookie, undecodable bytes replaced"""
+    try:
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    except SyntaxError:
+        encoding = 'utf-8'
+    return data.decode(encoding, errors='replace')
+
+
+def parse_imports(source, filename: str = '<unknown>') -> Set[str]:
+    """Dotted module of every absolute import statement in source (raises SyntaxError/ValueError)"""
+    imports = set()
+    tree = ast.parse(source, filename=filename)
+    for node in ast.walk(tree):
+        # "import module" or "import module as alias"
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                imports.add(name.name)
+        # "from module import something", relative imports are the project's own
+        elif isinstance(node, ast.ImportFrom):
+            if node.module and not node.level:
+                imports.add(node.module)
+    return imports
+
+
+def module_header(source: str) -> str:
+    """Source up to the first top-level def/class/decorator/`if __name__` outside strings and comments"""
+    strings = STRINGS_AND_COMMENTS.finditer(source)
+    current = next(strings, None)
+    for header in HEADER_END.finditer(source):
+        # Both scans only run as far as the header that ends the module
+        while current is not None and current.end() <= header.start():
+            current = next(strings, None)
+        if current is None or current.start() > header.start():
+            return source[:header.start()]
+    return source
+
+
+def scan_imports(source: str, top_only: bool = False) -> Set[str]:
+    """Dotted module of every absolute import statement found without parsing the file"""
+    if 'import' not in source:
+        return set()
+    if top_only:
+        source = module_header(source)
+    source = STRINGS_AND_COMMENTS.sub('', source)
+
+    imports = set()
+    for match in IMPORT_STATEMENT.finditer(source):
+        dots, module, names = match.groups()
+        if names is None:
+            if module and not dots:
+                imports.add(module)
+            continue
+        # import a.b as c, d \
+        #        e
+        for name in names.replace('\\\n', ' ').split(','):
+            words = name.split()
+            if words:
+                imports.add(words[0])
+    return {name for name in imports if all(part.isidentifier() for part in name.split('.'))}
+
+
+def scan_file(path: str, mode: str = 'fast') -> ScanResult:
+    """(path, sorted imports, None) or (path, None, error message)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if mode == 'ast':
+            try:
+                return path, sorted(parse_imports(data, path)), None
+            except (SyntaxError, ValueError):
+                pass  # the import lines may still be readable
+        return path, sorted(scan_imports(decode_source(data), top_only=(mode == 'top'))), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def scan_chunk(paths: List[str], mode: str = 'fast') -> List[ScanResult]:
+    """Pool task: one chunk of files"""
+    return [scan_file(path, mode) for path in paths]
+
+
+def scan_files(paths: Iterable[str], jobs: int = 1,
+               on_result: Optional[Callable[[ScanResult], None]] = None, mode: str = 'fast') -> List[ScanResult]:
+    """
+    Scan files, across `jobs` processes when there are enough of them
+
+    paths may be a generator (e.g. a directory walk): chunks are handed to
+    the pool as soon as they fill up, so parsing overlaps with the walk.
+
+    Args:
+        paths: Files to parse
+        jobs: Worker processes (1 = in this process)
+        on_result: Called in this process with every file's result as it arrives
+        mode: Extractor, one of MODES
+    """
+    results: List[ScanResult] = []
+
+    def collect(batch: List[ScanResult]) -> None:
+        for result in batch:
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    paths = iter(paths)
+    buffered: List[str] = []
+    if jobs > 1:
+        for path in paths:
+            buffered.append(path)
+            if len(buffered) >= MIN_POOL_FILES:
+                break
+
+    if jobs <= 1 or len(buffered) < MIN_POOL_FILES:
+        for path in itertools.chain(buffered, paths):
+            collect([scan_file(path, mode)])
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        chunk: List[str] = []
+        for path in itertools.chain(buffered, paths):
+            chunk.append(path)
+            if len(chunk) >= CHUNK_SIZE:
+                futures.append(pool.submit(scan_chunk, chunk, mode))
+                chunk = []
+        if chunk:
+            futures.append(pool.submit(scan_chunk, chunk, mode))
+        for future in as_completed(futures):
+            collect(future.result())
+    return results
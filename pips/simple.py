@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+# File: pips/simple.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: PEP 503 / PEP 691 simple repository pages built from PyPI JSON metadata
+# License: MIT
+
+"""
+simple.py
+
+Render "simple" repository pages (the API pip uses with --index-url) from the
+PyPI JSON metadata that PyPIClient already caches, or from a local download
+directory. Shared by `pips proxy`, `pips mirror` and `pips index`.
+"""
+
+import os
+import re
+import json
+import hashlib
+from html import escape
+from pathlib import Path
+from urllib.parse import urljoin
+from typing import Dict, Any, List, Callable, Iterable, Optional
+
+HTML_TYPE = "application/vnd.pypi.simple.v1+html"
+JSON_TYPE = "application/vnd.pypi.simple.v1+json"
+API_VERSION = "1.0"
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized project name"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def project_files(data: Dict[str, Any], base_url: str = "") -> List[Dict[str, Any]]:
+    """
+    Flatten PyPI JSON metadata into the file list of a simple project page
+
+    Args:
+        base_url: URL the metadata was fetched from, relative file URLs are resolved against it
+
+    Returns:
+        list: dicts with filename, url (upstream), hashes, requires_python, yanked, size
+    """
+    releases = data.get('releases') or {}
+    if not releases and data.get('urls'):
+        releases = {data.get('info', {}).get('version', ''): data['urls']}
+
+    files = []
+    for release_files in releases.values():
+        for file_info in release_files:
+            sha256 = (file_info.get('digests') or {}).get('sha256')
+            yanked = file_info.get('yanked', False)
+            if yanked:
+                yanked = file_info.get('yanked_reason') or True
+            files.append({
+                'filename': file_info['filename'],
+                'url': urljoin(base_url, file_info['url']) if base_url else file_info['url'],
+                'hashes': {'sha256': sha256} if sha256 else {},
+                'requires_python': file_info.get('requires_python'),
+                'yanked': yanked,
+                'size': file_info.get('size'),
+            })
+    files.sort(key=lambda f: f['filename'])
+    return files
+
+
+def file_sha256(path) -> str:
+    """Hex sha256 digest of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response content type from an Accept header (PEP 691), HTML if unspecified"""
+    if not accept:
+        return HTML_TYPE
+
+    best, best_q = None, -1.0
+    for part in accept.split(","):
+        fields = [field.strip() for field in part.split(';')]
+        media_type, q = fields[0].lower(), 1.0
+        for param in fields[1:]:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media_type in (JSON_TYPE, 'application/vnd.pypi.simple.latest+json'):
+            candidate = JSON_TYPE
+        elif media_type in (HTML_TYPE, 'application/vnd.pypi.simple.latest+html', 'text/html', '*/*'):
+            candidate = HTML_TYPE
+        else:
+            continue
+        # Earlier entries win ties
+        if q > best_q:
+            best, best_q = candidate, q
+    return best if best and best_q > 0 else HTML_TYPE
+
+
+def render_index(projects: Iterable[str], content_type: str = HTML_TYPE) -> bytes:
+    """Root /simple/ page listing projects"""
+    names = sorted({canonical_name(p) for p in projects})
+    if content_type == JSON_TYPE:
+        return json.dumps({
+            'meta': {'api-version': API_VERSION},
+            'projects': [{'name': name} for name in names],
+        }).encode('utf-8')
+
+    links = "\n".join(f'    <a href="{escape(name)}/">{escape(name)}</a><br/>' for name in names)
+    return (
+        "<!DOCTYPE html>\n<html>\n  <head>\n"
+        f'    <meta name="pypi:repository-version" content="{API_VERSION}">\n'
+        "    <title>Simple index</title>\n  </head>\n  <body>\n"
+        f"{links}\n  </body>\n</html>\n"
+    ).encode('utf-8')
+
+
+def render_project(name: str, files: List[Dict[str, Any]], url_for: Callable[[Dict[str, Any]], str],
+                   content_type: str = HTML_TYPE) -> bytes:
+    """
+    Project page /simple/<name>/
+
+    Args:
+        files: Output of project_files()
+        url_for: Maps a file entry to the URL clients should download it from
+    """
+    name = canonical_name(name)
+    if content_type == JSON_TYPE:
+        return json.dumps({
+            'meta': {'api-version': API_VERSION},
+            'name': name,
+            'files': [
+                {
+                    'filename': f['filename'],
+                    'url': url_for(f),
+                    'hashes': f['hashes'],
+                    **({'requires-python': f['requires_python']} if f.get('requires_python') else {}),
+                    **({'yanked': f['yanked']} if f.get('yanked') else {}),
+                    **({'size': f['size']} if f.get('size') is not None else {}),
+                }
+                for f in files
+            ],
+        }).encode('utf-8')
+
+    links = []
+    for f in files:
+        href = url_for(f)
+        if f['hashes'].get('sha256'):
+            href += f"#sha256={f['hashes']['sha256']}"
+        attrs = f'href="{escape(href)}"'
+        if f.get('requires_python'):
+            attrs += f' data-requires-python="{escape(f["requires_python"])}"'
+        if f.get('yanked'):
+            reason = f['yanked'] if isinstance(f['yanked'], str) else ""
+            attrs += f' data-yanked="{escape(reason)}"'
+        links.append(f"    <a {attrs}>{escape(f['filename'])}</a><br/>")
+
+    return (
+        "<!DOCTYPE html>\n<html>\n  <head>\n"
+        f'    <meta name="pypi:repository-version" content="{API_VERSION}">\n'
+        f"    <title>Links for {escape(name)}</title>\n  </head>\n  <body>\n"
+        f"    <h1>Links for {escape(name)}</h1>\n"
+        + "\n".join(links) + "\n  </body>\n</html>\n"
+    ).encode('utf-8')
+
+
+def write_atomic(path, data: bytes) -> None:
+    """Write a file so readers never see a partial page"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_project_pages(simple_dir, name: str, files: List[Dict[str, Any]],
+                        url_for: Callable[[Dict[str, Any]], str]) -> None:
+    """Write simple/<name>/index.html and index.json for a static index"""
+    project_dir = Path(simple_dir) / canonical_name(name)
+    write_atomic(project_dir / 'index.html', render_project(name, files, url_for, HTML_TYPE))
+    write_atomic(project_dir / 'index.json', render_project(name, files, url_for, JSON_TYPE))
+
+
+def write_index_pages(simple_dir, projects: Iterable[str]) -> None:
+    """Write the root simple/index.html and index.json"""
+    projects = list(projects)
+    write_atomic(Path(simple_dir) / 'index.html', render_index(projects, HTML_TYPE))
+    write_atomic(Path(simple_dir) / 'index.json', render_index(projects, JSON_TYPE))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# File: pips/stdlib.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Standard library and first-party module classification for pipr scans
+# License: MIT
+
+"""
+stdlib.py
+
+Decides which imported top-level names never need a distribution:
+
+- the standard library, from sys.stdlib_module_names (Python 3.10+), or
+  on older interpreters from a table generated from CPython 3.11 plus the
+  modules removed before 3.10 (formatter, parser, symbol, macpath, ...),
+- the project's own code: the top-level modules and packages the
+  scanned tree provides (at its root or in src/), and the sibling modules
+  of a script scanned on its own.
+"""
+
+import os
+import sys
+from pathlib import PurePosixPath
+from typing import FrozenSet, Optional, Set, Iterable
+
+# sys.stdlib_module_names of CPython 3.11 + modules removed in 3.8-3.10, for Python < 3.10
+LEGACY_STDLIB_MODULES = frozenset({
+    'abc', 'aifc', 'antigravity', 'argparse', 'array', 'ast', 'asynchat', 'asyncio', 'asyncore',
+    'atexit', 'audioop', 'base64', 'bdb', 'binascii', 'bisect', 'builtins', 'bz2', 'calendar',
+    'cgi', 'cgitb', 'chunk', 'cmath', 'cmd', 'code', 'codecs', 'codeop', 'collections',
+    'colorsys', 'compileall', 'concurrent', 'configparser', 'contextlib', 'contextvars', 'copy',
+    'copyreg', 'cProfile', 'crypt', 'csv', 'ctypes', 'curses', 'dataclasses', 'datetime', 'dbm',
+    'decimal', 'difflib', 'dis', 'distutils', 'doctest', 'dummy_threading', 'email',
+    'encodings', 'ensurepip', 'enum', 'errno', 'faulthandler', 'fcntl', 'filecmp', 'fileinput',
+    'fnmatch', 'formatter', 'fractions', 'ftplib', 'functools', 'gc', 'genericpath', 'getopt',
+    'getpass', 'gettext', 'glob', 'graphlib', 'grp', 'gzip', 'hashlib', 'heapq', 'hmac', 'html',
+    'http', 'idlelib', 'imaplib', 'imghdr', 'imp', 'importlib', 'inspect', 'io', 'ipaddress',
+    'itertools', 'json', 'keyword', 'lib2to3', 'linecache', 'locale', 'logging', 'lzma',
+    'macpath', 'mailbox', 'mailcap', 'marshal', 'math', 'mimetypes', 'mmap', 'modulefinder',
+    'msilib', 'msvcrt', 'multiprocessing', 'netrc', 'nis', 'nntplib', 'nt', 'ntpath',
+    'nturl2path', 'numbers', 'opcode', 'operator', 'optparse', 'os', 'ossaudiodev', 'parser',
+    'pathlib', 'pdb', 'pickle', 'pickletools', 'pipes', 'pkgutil', 'platform', 'plistlib',
+    'poplib', 'posix', 'posixpath', 'pprint', 'profile', 'pstats', 'pty', 'pwd', 'py_compile',
+    'pyclbr', 'pydoc', 'pydoc_data', 'pyexpat', 'queue', 'quopri', 'random', 're', 'readline',
+    'reprlib', 'resource', 'rlcompleter', 'runpy', 'sched', 'secrets', 'select', 'selectors',
+    'shelve', 'shlex', 'shutil', 'signal', 'site', 'smtpd', 'smtplib', 'sndhdr', 'socket',
+    'socketserver', 'spwd', 'sqlite3', 'sre_compile', 'sre_constants', 'sre_parse', 'ssl',
+    'stat', 'statistics', 'string', 'stringprep', 'struct', 'subprocess', 'sunau', 'symbol',
+    'symtable', 'sys', 'sysconfig', 'syslog', 'tabnanny', 'tarfile', 'telnetlib', 'tempfile',
+    'termios', 'textwrap', 'this', 'threading', 'time', 'timeit', 'tkinter', 'token',
+    'tokenize', 'tomllib', 'trace', 'traceback', 'tracemalloc', 'tty', 'turtle', 'turtledemo',
+    'types', 'typing', 'unicodedata', 'unittest', 'urllib', 'uu', 'uuid', 'venv', 'warnings',
+    'wave', 'weakref', 'webbrowser', 'winreg', 'winsound', 'wsgiref', 'xdrlib', 'xml', 'xmlrpc',
+    'zipapp', 'zipfile', 'zipimport', 'zlib', 'zoneinfo', '__future__', '_abc', '_aix_support',
+    '_ast', '_asyncio', '_bisect', '_blake2', '_bootlocale', '_bootsubprocess', '_bz2',
+    '_codecs', '_codecs_cn', '_codecs_hk', '_codecs_iso2022', '_codecs_jp', '_codecs_kr',
+    '_codecs_tw', '_collections', '_collections_abc', '_compat_pickle', '_compression',
+    '_contextvars', '_crypt', '_csv', '_ctypes', '_curses', '_curses_panel', '_datetime',
+    '_dbm', '_decimal', '_dummy_thread', '_elementtree', '_frozen_importlib',
+    '_frozen_importlib_external', '_functools', '_gdbm', '_hashlib', '_heapq', '_imp', '_io',
+    '_json', '_locale', '_lsprof', '_lzma', '_markupbase', '_md5', '_msi', '_multibytecodec',
+    '_multiprocessing', '_opcode', '_operator', '_osx_support', '_overlapped', '_pickle',
+    '_posixshmem', '_posixsubprocess', '_py_abc', '_pydecimal', '_pyio', '_queue', '_random',
+    '_scproxy', '_sha1', '_sha256', '_sha3', '_sha512', '_signal', '_sitebuiltins', '_socket',
+    '_sqlite3', '_sre', '_ssl', '_stat', '_statistics', '_string', '_strptime', '_struct',
+    '_symtable', '_thread', '_threading_local', '_tkinter', '_tokenize', '_tracemalloc',
+    '_typing', '_uuid', '_warnings', '_weakref', '_weakrefset', '_winapi', '_zoneinfo'
+})
+
+
+def stdlib_modules() -> FrozenSet[str]:
+    """Top-level standard library module names of the running interpreter"""
+    names = getattr(sys, 'stdlib_module_names', None)
+    if names:
+        return frozenset(names) | {'__main__'}
+    return LEGACY_STDLIB_MODULES | {'__main__'}
+
+
+def first_party_from_paths(relpaths: Iterable[str]) -> Set[str]:
+    """
+    Top-level names a scanned tree provides itself
+
+    Counted: modules right below the root or its src/ folder, and the
+    directories holding Python code there (regular and namespace packages).
+    Modules inside a package are only importable through it (proj.celery is
+    not `import celery`), so their names do not count.
+    """
+    names = set()
+    for relpath in relpaths:
+        path = PurePosixPath(relpath)
+        if path.suffix != '.py':
+            continue
+        parts = path.parts
+        if parts[0] == 'src' and len(parts) > 1:
+            parts = parts[1:]
+        names.add(path.stem if len(parts) == 1 else parts[0])
+    names.discard('__init__')
+    names.discard('__main__')
+    return {name for name in names if name.isidentifier()}
+
+
+PROJECT_MARKERS = ('pyproject.toml', 'setup.py', 'setup.cfg', '.git')
+
+
+def project_root(directory: str) -> Optional[str]:
+    """Nearest directory at or above `directory` that looks like a project root"""
+    directory = os.path.abspath(directory)
+    while True:
+        if any(os.path.exists(os.path.join(directory, marker)) for marker in PROJECT_MARKERS):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def first_party_near(file_path) -> Set[str]:
+    """Modules and packages next to a single scanned script, and at its project root (and src/)"""
+    names = set()
+    directory = os.path.dirname(os.path.abspath(file_path))
+    # Siblings are importable by name only when the file runs as a script, not from inside a package
+    bases = [] if os.path.exists(os.path.join(directory, '__init__.py')) else [directory]
+    root = project_root(directory)
+    if root:
+        bases += [root, os.path.join(root, 'src')]
+    for base in dict.fromkeys(bases):
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith('.py'):
+                        names.add(entry.name[:-3])
+                    elif entry.is_dir() and os.path.exists(os.path.join(entry.path, '__init__.py')):
+                        names.add(entry.name)
+        except OSError:
+            continue
+    names.discard('__init__')
+    names.discard('setup')
+    return {name for name in names if name.isidentifier()}
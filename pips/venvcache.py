@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+# File: pips/venvcache.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Virtualenvs keyed by requirement set, cloned from a prebuilt template
+# License: MIT
+
+"""
+venvcache.py
+
+pipr creates a virtualenv when requirements conflict with the current
+environment. Every venv it fills is tagged with a key derived from the
+requirement set, the Python version and the platform, so an identical
+request later reuses the venv instead of building it again.
+
+New venvs are not created with `python -m venv` each time. A template venv
+(with pip seeded from the interpreter's bundled ensurepip wheel, upgraded
+from PyPI only with PIPS_VENV_UPGRADE_PIP=1) is built once per interpreter
+and cloned with hardlinks. Only the few files that embed the venv path
+(scripts and pyvenv.cfg) are copied and rewritten.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import platform
+import sysconfig
+import subprocess
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger('pips')
+
+MARKER_NAME = '.pips-venv.json'
+TEMPLATES_DIR = '.templates'
+
+
+def python_tag() -> str:
+    """Interpreter identity used in cache keys, e.g. cpython-3.12.3"""
+    return f"{sys.implementation.name}-{'.'.join(str(v) for v in sys.version_info[:3])}"
+
+
+def requirements_key(specs: List[str]) -> str:
+    """Stable key for a requirement set on this interpreter and platform"""
+    normalized = sorted({' '.join(spec.split()).lower() for spec in specs if spec and spec.strip()})
+    payload = json.dumps({
+        'requirements': normalized,
+        'python': python_tag(),
+        'platform': sysconfig.get_platform(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def upgrade_pip_requested() -> bool:
+    """PIPS_VENV_UPGRADE_PIP=1: upgrade pip from PyPI when a template is built"""
+    return os.environ.get('PIPS_VENV_UPGRADE_PIP', '').lower() in ('1', 'yes', 'true')
+
+
+def venv_python(venv_path: Path) -> Path:
+    """Interpreter inside a venv"""
+    if platform.system().lower() == "windows":
+        return Path(venv_path) / "Scripts" / "python.exe"
+    return Path(venv_path) / "bin" / "python"
+
+
+class VenvCache:
+    """Keyed venvs under one base directory plus the per-interpreter template they are cloned from"""
+
+    def __init__(self, base: Path):
+        self.base = Path(base)
+
+    # Lookup -----------------------------------------------------------------
+
+    @staticmethod
+    def read_marker(venv_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(Path(venv_path) / MARKER_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def find(self, key: str) -> Optional[Path]:
+        """A working venv built for this key, if any"""
+        try:
+            candidates = [p for p in self.base.iterdir() if p.is_dir() and not p.name.startswith('.')]
+        except OSError:
+            return None
+        for venv_path in candidates:
+            marker = self.read_marker(venv_path)
+            if marker and marker.get('key') == key and venv_python(venv_path).exists():
+                return venv_path
+        return None
+
+    def mark(self, venv_path: Path, key: str, specs: List[str]) -> None:
+        """Record the requirement set a venv now satisfies"""
+        marker = {
+            'key': key,
+            'requirements': sorted(specs),
+            'python': python_tag(),
+            'platform': sysconfig.get_platform(),
+            'created': time.time(),
+        }
+        with open(Path(venv_path) / MARKER_NAME, 'w', encoding='utf-8') as f:
+            json.dump(marker, f, indent=2)
+
+    # Template ---------------------------------------------------------------
+
+    def template(self) -> Path:
+        """Template venv for the running interpreter, built on first use"""
+        path = self.base / TEMPLATES_DIR / f"{python_tag()}-{sysconfig.get_platform()}"
+        if venv_python(path).exists():
+            return path
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        building = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(building, ignore_errors=True)
+        logger.info(f"Building venv template {path.name}")
+        # ensurepip installs the pip wheel bundled with Python: no network needed
+        subprocess.check_call([sys.executable, "-m", "venv", str(building)])
+        if upgrade_pip_requested():
+            self._upgrade_pip(building)
+
+        # The template must embed its final path, so it is built under a temporary
+        # name and cloned into place like any other venv
+        try:
+            self._clone(building, path)
+        finally:
+            shutil.rmtree(building, ignore_errors=True)
+        return path
+
+    @staticmethod
+    def _upgrade_pip(venv_path: Path) -> None:
+        """Networked pip upgrade, only with PIPS_VENV_UPGRADE_PIP=1 (the bundled pip is kept on failure)"""
+        try:
+            result = subprocess.run([str(venv_python(venv_path)), "-m", "pip", "install", "--upgrade", "--quiet", "pip"],
+                                    capture_output=True, text=True, timeout=120)
+        except subprocess.TimeoutExpired:
+            logger.warning("pip upgrade in venv template timed out, keeping the bundled pip")
+            return
+        if result.returncode != 0:
+            logger.warning(f"pip upgrade in venv template failed, keeping the bundled pip: {result.stderr.strip()}")
+
+    # Clone ------------------------------------------------------------------
+
+    def clone(self, venv_path: Path) -> Path:
+        """Create a new venv at venv_path from the template"""
+        return self._clone(self.template(), Path(venv_path))
+
+    @staticmethod
+    def _clone(source: Path, target: Path) -> Path:
+        old, new = str(source.absolute()).encode(), str(target.absolute()).encode()
+        staging = target.with_name(f".{target.name}.{os.getpid()}.clone")
+        shutil.rmtree(staging, ignore_errors=True)
+        script_dirs = {'bin', 'Scripts'}
+
+        for dirpath, dirnames, filenames in os.walk(source):
+            rel = Path(dirpath).relative_to(source)
+            (staging / rel).mkdir(parents=True, exist_ok=True)
+            for name in dirnames + filenames:
+                src, dst = Path(dirpath) / name, staging / rel / name
+                if src.is_symlink():
+                    # bin/python points at the base interpreter, links pointing inside the venv stay relative
+                    os.symlink(os.readlink(src), dst)
+                    if name in dirnames:
+                        dirnames.remove(name)
+                    continue
+                if name in dirnames:
+                    continue
+
+                if name == MARKER_NAME:
+                    continue
+                if rel.parts[:1] and rel.parts[0] in script_dirs or (not rel.parts and name == 'pyvenv.cfg'):
+                    data = src.read_bytes()
+                    if old in data:
+                        dst.write_bytes(data.replace(old, new))
+                        shutil.copymode(src, dst)
+                        continue
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copy2(src, dst)
+
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(staging, target)
+        return target
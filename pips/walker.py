@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+# File: pips/walker.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: Pruning os.scandir walker for import scans (.gitignore, excludes, virtualenvs)
+# License: MIT
+
+"""
+walker.py
+
+Lists the Python files of a project without descending into what is not
+the project's own code:
+
+- directories matched by .gitignore files (root and nested, with
+  negation, anchoring and ** like git),
+- the default exclude list (VCS metadata, caches, build output,
+  node_modules, site-packages) plus PIPS_SCAN_EXCLUDE / pipr --exclude,
+- virtualenvs and conda environments, detected by their pyvenv.cfg or
+  conda-meta whatever they are called.
+
+Paths are yielded as they are found so parsing can start before the walk
+has finished.
+"""
+
+import os
+import re
+import logging
+from typing import Optional, List, Tuple, Iterator, Iterable, Pattern, Callable
+
+logger = logging.getLogger('pips')
+
+DEFAULT_EXCLUDES = [
+    '.git/', '.hg/', '.svn/', '__pycache__/', 'node_modules/',
+    '.tox/', '.nox/', '.eggs/', '*.egg-info/', 'build/', 'dist/',
+    'site-packages/', 'dist-packages/', '.mypy_cache/', '.pytest_cache/', '.ruff_cache/',
+]
+ENV_MARKERS = ('pyvenv.cfg', 'conda-meta')
+
+Rule = Tuple[str, Pattern, bool, bool]  # base, regex, negated, directories only
+
+
+def default_excludes() -> List[str]:
+    """Built-in excludes plus PIPS_SCAN_EXCLUDE (comma separated gitignore patterns)"""
+    # os.environ, not os.getenv: envdot swaps in a getenv that parses 'a,b' into a list
+    extra = [p.strip() for p in os.environ.get('PIPS_SCAN_EXCLUDE', '').split(',') if p.strip()]
+    return DEFAULT_EXCLUDES + extra
+
+
+def _translate(pattern: str) -> str:
+    """gitignore glob -> regex body (`*` and `?` stay within one path segment)"""
+    result, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**/', i):
+                result.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                result.append('.*')
+                i += 2
+                continue
+            result.append('[^/]*')
+        elif c == '?':
+            result.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                result.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                result.append(f"[{body}]")
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(c))
+        i += 1
+    return ''.join(result)
+
+
+def compile_rule(line: str, base: str = '') -> Optional[Rule]:
+    """One gitignore line relative to base (a posix relpath, '' for the root), None for comments/blanks"""
+    line = line.rstrip('\n').rstrip('\r')
+    if not line.strip() or line.startswith('#'):
+        return None
+    line = line.rstrip(' ') if not line.endswith('\\ ') else line
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    if '/' in line:
+        # Anchored to the directory of the .gitignore
+        regex = '^' + _translate(line.lstrip('/')) + '$'
+    else:
+        regex = '^(?:.*/)?' + _translate(line) + '$'
+    return base, re.compile(regex), negated, dir_only
+
+
+def read_rules(directory: str, base: str) -> List[Rule]:
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    return [rule for rule in (compile_rule(line, base) for line in lines) if rule]
+
+
+def is_ignored(relpath: str, is_dir: bool, rules: Iterable[Rule]) -> bool:
+    """Last matching rule wins, like git"""
+    ignored = False
+    for base, regex, negated, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if base:
+            if not relpath.startswith(base + '/'):
+                continue
+            path = relpath[len(base) + 1:]
+        else:
+            path = relpath
+        if regex.match(path):
+            ignored = not negated
+    return ignored
+
+
+def is_environment(path: str) -> bool:
+    """A virtualenv or conda environment, whatever its name"""
+    return any(os.path.exists(os.path.join(path, marker)) for marker in ENV_MARKERS)
+
+
+def iter_python_files(root, recursive: bool = True, excludes: Optional[List[str]] = None,
+                      use_gitignore: bool = True, on_directory: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+    """
+    Yield .py files under root, pruning ignored directories before entering them
+
+    Args:
+        root: Directory to walk
+        recursive: Descend into subdirectories
+        excludes: gitignore-style patterns applied from root (default: default_excludes())
+        use_gitignore: Honor .gitignore files found along the way
+        on_directory: Called with every subdirectory that is walked into
+    """
+    root = os.path.abspath(root)
+    base_rules = [rule for rule in (compile_rule(p) for p in (default_excludes() if excludes is None else excludes)) if rule]
+    stack: List[Tuple[str, str, List[Rule]]] = [(root, '', base_rules)]
+
+    while stack:
+        directory, relative, rules = stack.pop()
+        if use_gitignore:
+            rules = rules + read_rules(directory, relative)
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda e: e.name)
+        except OSError as e:
+            logger.debug(f"Cannot list {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            relpath = f"{relative}/{entry.name}" if relative else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if is_dir:
+                if not recursive or is_ignored(relpath, True, rules):
+                    continue
+                if is_environment(entry.path):
+                    logger.debug(f"Skipping environment {entry.path}")
+                    continue
+                if on_directory:
+                    on_directory(entry.path)
+                subdirs.append((entry.path, relpath, rules))
+            elif is_file and entry.name.endswith('.py') and not is_ignored(relpath, False, rules):
+                yield entry.path
+        # Depth first in name order
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+# File: pips/watch.py
+# Author: Hadi Cahyadi <cumulus13@gmail.com>
+# Date: 2026-01-02
+# Description: File change watching for pipr --watch (inotify, polling fallback)
+# License: MIT
+
+"""
+watch.py
+
+Tells pipr --watch which project files changed, in debounced batches:
+
+- on Linux through inotify (via ctypes, no extra dependency), with one
+  watch per directory the scan walks into, so ignored trees and
+  virtualenvs cost nothing,
+- elsewhere, or with PIPS_WATCH_POLL=1, by comparing stat signatures of the
+  walked files every interval.
+
+Only Python files and requirement declarations (requirements*.txt,
+pyproject.toml, setup.py) are reported. A burst of events (a
+checkout, a formatter run, an editor's save dance) is collected until the
+tree has been quiet for the debounce delay, and handed over as one batch.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import ctypes
+import ctypes.util
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List, Set, Tuple
+
+try:
+    from .walker import iter_python_files  # type: ignore
+except ImportError:
+    from walker import iter_python_files  # type: ignore
+
+logger = logging.getLogger('pips')
+
+DECLARATION_FILES = ('pyproject.toml', 'setup.py')
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_declaration(name: str) -> bool:
+    """A file that declares requirements"""
+    return name in DECLARATION_FILES or (name.startswith('requirements') and name.endswith('.txt'))
+
+
+def is_watched(name: str) -> bool:
+    return name.endswith('.py') or is_declaration(name)
+
+
+class Watcher(ABC):
+    """Debounced batches of changed project files under one root"""
+
+    def __init__(self, root, recursive: bool = True, excludes: Optional[List[str]] = None,
+                 use_gitignore: bool = True, debounce: float = 0.3):
+        """
+        Args:
+            root: Directory to watch
+            recursive: Watch subdirectories too
+            excludes: gitignore-style patterns, as for walker.iter_python_files
+            use_gitignore: Honor .gitignore files
+            debounce: Quiet time that ends a batch of events, in seconds
+        """
+        self.root = os.path.abspath(root)
+        self.recursive = recursive
+        self.excludes = excludes
+        self.use_gitignore = use_gitignore
+        self.debounce = debounce
+
+    def walk(self, on_directory=None) -> List[str]:
+        """The project's Python files and the requirement declarations at the root"""
+        paths = list(iter_python_files(self.root, recursive=self.recursive, excludes=self.excludes,
+                                       use_gitignore=self.use_gitignore, on_directory=on_directory))
+        try:
+            with os.scandir(self.root) as entries:
+                paths += [entry.path for entry in entries if is_declaration(entry.name) and entry.is_file()]
+        except OSError:
+            pass
+        return paths
+
+    @abstractmethod
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        """Changed paths seen within timeout (empty on timeout)"""
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """
+        Next batch of changed paths, collected until the tree is quiet for `debounce` seconds
+
+        Returns an empty set if nothing changed within timeout.
+        """
+        changed = self.poll(timeout)
+        while changed:
+            more = self.poll(self.debounce)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'Watcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    """Compares stat signatures of the walked files every interval"""
+
+    def __init__(self, root, recursive: bool = True, excludes: Optional[List[str]] = None,
+                 use_gitignore: bool = True, debounce: float = 0.3, interval: float = 1.0):
+        super().__init__(root, recursive, excludes, use_gitignore, debounce)
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.walk():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.take_snapshot()
+            changed = {path for path in set(snapshot) | set(self.snapshot)
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(pause)
+
+
+class InotifyWatcher(Watcher):
+    """One inotify watch per directory the walker enters (Linux)"""
+
+    def __init__(self, root, recursive: bool = True, excludes: Optional[List[str]] = None,
+                 use_gitignore: bool = True, debounce: float = 0.3):
+        super().__init__(root, recursive, excludes, use_gitignore, debounce)
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_init1: {os.strerror(ctypes.get_errno())}")
+        self.directories: Dict[int, str] = {}
+        self.sync()
+
+    def add(self, directory: str) -> None:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                logger.warning("inotify watch limit reached (fs.inotify.max_user_watches), some directories are not watched")
+            else:
+                logger.debug(f"Cannot watch {directory}: {os.strerror(error)}")
+            return
+        self.directories[wd] = directory
+
+    def sync(self) -> None:
+        """Watch every directory the walker enters now (re-adding a watched one is a no-op)"""
+        self.add(self.root)
+        self.walk(on_directory=self.add)
+
+    def poll(self, timeout: Optional[float]) -> Set[str]:
+        try:
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+        except InterruptedError:
+            return set()
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed, new_directories = set(), False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: treat the whole tree as changed
+                logger.debug("inotify queue overflow")
+                changed.add(self.root)
+                new_directories = True
+                continue
+            if mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    new_directories = True
+                if mask & (IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+                    # Python files may have appeared or gone with it
+                    changed.add(path)
+            elif is_watched(os.fsdecode(name)):
+                changed.add(path)
+
+        if new_directories:
+            self.sync()
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(root, recursive: bool = True, excludes: Optional[List[str]] = None,
+                   use_gitignore: bool = True, poll: bool = False, interval: float = 1.0) -> Watcher:
+    """inotify where available, polling otherwise (or with poll / PIPS_WATCH_POLL=1)"""
+    poll = poll or os.environ.get('PIPS_WATCH_POLL', '').lower() in ('1', 'yes', 'true')
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root, recursive, excludes, use_gitignore)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify unavailable, polling instead: {e}")
+    return PollingWatcher(root, recursive, excludes, use_gitignore, interval=interval)
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# pips.pips and pips.pipr open their log files when imported, keep them out of the checkout
+os.environ['PIPS_LOG_DIR'] = tempfile.mkdtemp(prefix='pips-test-logs-')
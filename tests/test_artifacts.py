@@ -0,0 +1,159 @@
+import io
+import json
+import time
+import hashlib
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from pips.pips import CacheBundle, PackageInstaller, PipsError, PyPIClient, TierStats, find_offline_artifacts
+
+
+def sha256(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def make_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(PyPIClient, 'CACHE_DIR', tmp_path / 'cache')
+    return PyPIClient(use_cache=True, use_redis=False, use_daemon=False, tier_stats=TierStats(persist=False))
+
+
+def make_wheel(root, payload=b'wheel'):
+    path = root / 'demo-1.0-py3-none-any.whl'
+    path.write_bytes(payload)
+    return path
+
+
+def test_artifact_without_digest_is_unverified(tmp_path):
+    path = make_wheel(tmp_path)
+    assert PackageInstaller.verify_artifacts(tmp_path, [(path, '')]) == ([], [path.name])
+    assert PackageInstaller.verify_artifacts(tmp_path, [(path, 'f' * 64)]) == ([path.name], [])
+    assert PackageInstaller.verify_artifacts(tmp_path, [(path, sha256(b'wheel'))]) == ([], [])
+
+
+def build_wheel(root, name, version, requires=()):
+    path = root / f'{name}-{version}-py3-none-any.whl'
+    metadata = f'Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n'
+    metadata += ''.join(f'Requires-Dist: {requirement}\n' for requirement in requires)
+    with zipfile.ZipFile(path, 'w') as wheel:
+        wheel.writestr(f'{name}.py', '')
+        wheel.writestr(f'{name}-{version}.dist-info/METADATA', metadata)
+        wheel.writestr(f'{name}-{version}.dist-info/WHEEL',
+                       'Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n')
+        wheel.writestr(f'{name}-{version}.dist-info/RECORD', '')
+    return path
+
+
+@pytest.fixture
+def local_release(tmp_path, monkeypatch):
+    """pipsdemoapp 1.0 depending on pipsdemolib, both downloaded, with PyPI digests in the file cache"""
+    client = make_client(tmp_path, monkeypatch)
+    root = tmp_path / 'wheels'
+    root.mkdir()
+    app = build_wheel(root, 'pipsdemoapp', '1.0', ['pipsdemolib>=1'])
+    lib = build_wheel(root, 'pipsdemolib', '1.0')
+    for path in (app, lib):
+        name = path.name.split('-')[0]
+        client._save_to_cache(f'package_version:{name}:1.0', {'urls': [
+            {'filename': path.name, 'digests': {'sha256': sha256(path.read_bytes())}}]})
+
+    installer = PackageInstaller()
+    installs = []
+
+    def fake_install(options, spec, label):
+        installs.append(Path(options[options.index('-r') + 1]).read_text())
+    monkeypatch.setattr(installer, '_pip_install', fake_install)
+    return installer, client, root, app, lib, installs
+
+
+def test_local_install_pins_every_planned_file_to_its_pypi_digest(local_release):
+    installer, client, root, app, lib, installs = local_release
+    installer.install_local('pipsdemoapp==1.0', root, [(app, sha256(app.read_bytes()))], offline=True, client=client)
+    assert installs == [f'pipsdemoapp==1.0 --hash=sha256:{sha256(app.read_bytes())}\n'
+                        f'pipsdemolib==1.0 --hash=sha256:{sha256(lib.read_bytes())}\n']
+
+
+def test_tampered_dependency_is_not_installed(local_release):
+    installer, client, root, app, lib, installs = local_release
+    build_wheel(root, 'pipsdemolib', '1.0', ['evil'])
+    assert installer.install_local('pipsdemoapp==1.0', root, [(app, sha256(app.read_bytes()))],
+                                   offline=True, client=client) is False
+    assert installs == []
+
+
+def test_unverified_artifact_is_not_installed_unless_allowed(local_release):
+    installer, client, root, app, lib, installs = local_release
+    client.clear_cache()
+
+    assert installer.install_local('pipsdemoapp==1.0', root, [(app, '')], offline=True, client=client) is False
+    assert installs == []
+
+    installer.install_local('pipsdemoapp==1.0', root, [(app, '')], offline=True, allow_unverified=True, client=client)
+    assert len(installs) == 1 and f'--hash=sha256:{sha256(lib.read_bytes())}' in installs[0]
+
+
+def make_bundle(path, digest):
+    entry = {'key': 'package_info:demo', 'expires': time.time() + 3600,
+             'data': {'urls': [{'filename': 'demo-1.0-py3-none-any.whl', 'digests': {'sha256': digest}}]}}
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, payload in (('manifest.json', json.dumps({'version': CacheBundle.BUNDLE_VERSION}).encode()),
+                              ('entries.jsonl', json.dumps(entry).encode()),
+                              ('artifacts/demo-1.0-py3-none-any.whl', b'wheel')):
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+    return path
+
+
+def test_bundle_import_skips_artifacts_without_digest(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch)
+    bundle = make_bundle(tmp_path / 'bundle.tar.gz', '')
+
+    result = CacheBundle(client).import_bundle(bundle, tmp_path / 'skipped', to_redis=False)
+    assert (result['artifacts'], result['unverified']) == (0, 1)
+    assert not (tmp_path / 'skipped' / 'demo-1.0-py3-none-any.whl').exists()
+
+    result = CacheBundle(client).import_bundle(bundle, tmp_path / 'allowed', to_redis=False, allow_unverified=True)
+    assert result['artifacts'] == 1
+
+    verified = make_bundle(tmp_path / 'verified.tar.gz', sha256(b'wheel'))
+    result = CacheBundle(client).import_bundle(verified, tmp_path / 'verified', to_redis=False)
+    assert (result['artifacts'], result['unverified']) == (1, 0)
+
+
+def test_offline_artifacts_come_from_disk_and_the_stale_file_cache(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch)
+    monkeypatch.setattr(client, '_fetch_json', lambda *args, **kwargs: pytest.fail('offline lookup hit PyPI'))
+    root = tmp_path / 'wheels'
+    (root / 'demo').mkdir(parents=True)
+    old = root / 'demo' / 'demo-1.0-py3-none-any.whl'
+    old.write_bytes(b'old')
+    new = root / 'Demo-1.10.tar.gz'
+    new.write_bytes(b'new')
+    (root / 'other-2.0-py3-none-any.whl').write_bytes(b'other')
+    client._save_to_cache('package_info:demo', {'releases': {'1.10': [
+        {'filename': new.name, 'digests': {'sha256': sha256(b'new')}}]}}, mtime=0)
+
+    assert find_offline_artifacts(root, 'demo', None, client) == ('1.10', [(new, sha256(b'new'))])
+    assert find_offline_artifacts(root, 'demo', '1.0', client) == ('1.0', [(old, '')])
+    assert find_offline_artifacts(root, 'demo', '2.0', client) == ('2.0', [])
+
+
+def test_bundle_import_leaves_no_partial_artifact(tmp_path, monkeypatch):
+    client = make_client(tmp_path, monkeypatch)
+    bundle = make_bundle(tmp_path / 'bundle.tar.gz', sha256(b'wheel'))
+
+    read = tarfile.ExFileObject.read
+
+    def broken_read(self, *args):
+        # Manifest and entries are read whole, artifacts in chunks
+        if args:
+            raise OSError('truncated bundle')
+        return read(self, *args)
+    monkeypatch.setattr(tarfile.ExFileObject, 'read', broken_read)
+
+    with pytest.raises(PipsError):
+        CacheBundle(client).import_bundle(bundle, tmp_path / 'artifacts', to_redis=False)
+    assert list((tmp_path / 'artifacts').iterdir()) == []
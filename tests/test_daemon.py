@@ -0,0 +1,58 @@
+import threading
+import time
+from urllib.error import HTTPError
+
+import pytest
+
+import pips.pips
+from pips.daemon import DaemonClient, PipsDaemon
+from pips.pips import NotFoundError, PyPIClient, TierStats
+
+
+def make_client(tmp_path, monkeypatch, use_daemon):
+    monkeypatch.setattr(PyPIClient, 'CACHE_DIR', tmp_path / 'cache')
+    return PyPIClient(use_cache=True, use_redis=False, use_daemon=use_daemon, tier_stats=TierStats(persist=False))
+
+
+@pytest.fixture
+def pypi_404(monkeypatch):
+    def urlopen(request, timeout=None):
+        raise HTTPError(request.full_url, 404, 'Not Found', {}, None)
+    monkeypatch.setattr(pips.pips, 'urlopen', urlopen)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch, pypi_404):
+    socket_path = tmp_path / 'pips.sock'
+    monkeypatch.setenv('PIPS_DAEMON_SOCKET', str(socket_path))
+    server = PipsDaemon(make_client(tmp_path, monkeypatch, use_daemon=False), socket_path)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield server
+    DaemonClient(socket_path).call('shutdown')
+    thread.join(5)
+
+
+def test_unknown_package_is_not_found_without_the_daemon(tmp_path, monkeypatch, pypi_404):
+    client = make_client(tmp_path, monkeypatch, use_daemon=False)
+    with pytest.raises(NotFoundError, match="Package 'ghost' not found on PyPI"):
+        client.get_package_info('ghost')
+
+
+def test_unknown_package_is_not_found_through_the_daemon(tmp_path, monkeypatch, daemon):
+    client = make_client(tmp_path, monkeypatch, use_daemon=True)
+    assert client.daemon and client.daemon.available
+    with pytest.raises(NotFoundError, match="Version '9.9' not found for package 'ghost'"):
+        client.get_package_version('ghost', '9.9')
+    assert client.hits['network'] == 0
+    assert daemon.requests == 1
+
+
+def test_daemon_reports_the_upstream_status(tmp_path, monkeypatch, pypi_404):
+    server = PipsDaemon(make_client(tmp_path, monkeypatch, use_daemon=False), tmp_path / 'pips.sock')
+    response = server.handle({'op': 'fetch', 'url': 'https://pypi.org/pypi/ghost/json', 'cache_key': 'package_info:ghost'})
+    assert response['ok'] is False and response['status'] == 404
+    assert 'status' not in server.handle({'op': 'unknown'})
@@ -0,0 +1,43 @@
+import os
+import re
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Loaded only by the command paths that need them
+DEFERRED = {
+    'pips.pips': ['pips.pipr', 'pypi_info', 'licface', 'redis', 'envdot', 'tarfile', 'rich.progress', 'requests', 'gntp'],
+    'pips.pipr': ['pypi_info', 'licface', 'redis', 'tarfile', 'rich.progress', 'requests', 'gntp'],
+}
+# Cumulative -X importtime budget in milliseconds (it was ~770ms for pips.pips before imports were deferred)
+BUDGET_MS = {
+    'pips.pips': float(os.getenv('PIPS_IMPORT_BUDGET_MS', '350')),
+    'pips.pipr': float(os.getenv('PIPR_IMPORT_BUDGET_MS', '500')),
+}
+
+
+def run(tmp_path, code, *flags):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), HOME=str(tmp_path))
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=str(tmp_path), env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+@pytest.mark.parametrize('module', sorted(DEFERRED))
+def test_heavy_modules_are_deferred(module, tmp_path):
+    code = f"import sys, {module}; print(','.join(m for m in {DEFERRED[module]!r} if m in sys.modules))"
+    result = run(tmp_path, code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
+
+
+@pytest.mark.parametrize('module', sorted(BUDGET_MS))
+def test_import_time_budget(module, tmp_path):
+    result = run(tmp_path, f"import {module}", '-X', 'importtime')
+    assert result.returncode == 0, result.stderr
+    line = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", result.stderr, re.MULTILINE)
+    assert line, result.stderr[-2000:]
+    assert int(line.group(1)) / 1000 <= BUDGET_MS[module]
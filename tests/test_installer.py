@@ -0,0 +1,18 @@
+import time
+
+from pips.installer import BatchInstaller
+
+PYPROJECT_FAILURE = "ERROR: Failed to build installable wheels for some pyproject.toml based projects (numpy)"
+
+
+def test_pyproject_build_failure_is_attributed_quickly():
+    start = time.monotonic()
+    blamed = BatchInstaller.attribute_failures(PYPROJECT_FAILURE, ['numpy==2.0.0', 'requests'])
+    assert time.monotonic() - start < 1.0
+    assert list(blamed) == ['numpy==2.0.0']
+
+
+def test_failed_to_build_lists_every_name():
+    output = "Failed to build lxml pillow"
+    blamed = BatchInstaller.attribute_failures(output, ['lxml', 'pillow', 'requests'])
+    assert sorted(blamed) == ['lxml', 'pillow']
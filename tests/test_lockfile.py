@@ -0,0 +1,113 @@
+import pytest
+
+from pips.lockfile import Lockfile, release_files
+from pips.pipr import PIPS
+
+
+def artifact(name, version, yanked=False, digest=True):
+    filename = f'{name}-{version}-py3-none-any.whl'
+    return {'filename': filename, 'url': f'https://files.example/{filename}', 'yanked': yanked,
+            'digests': {'sha256': f'{name}{version}'.ljust(64, '0')} if digest else {}}
+
+
+class FakePyPI:
+    """get_pypi_info over an in-memory index: {name: {version: requires_dist}}"""
+
+    def __init__(self, index):
+        self.index = index
+        self.calls = []
+
+    def __call__(self, name, version=None):
+        self.calls.append((name, version))
+        releases = self.index.get(name)
+        if releases is None:
+            return None
+        latest = max(releases, key=lambda v: tuple(int(p) for p in v.split('.')))
+        if version:
+            return {'info': {'name': name, 'version': version, 'requires_dist': releases[version]},
+                    'urls': [artifact(name, version)]}
+        return {'info': {'name': name, 'version': latest, 'requires_dist': releases[latest]},
+                'releases': {v: [artifact(name, v)] for v in releases}}
+
+
+def strip_digests(data, name):
+    if data and data['info']['name'] == name:
+        for files in list((data.get('releases') or {}).values()) + [data.get('urls') or []]:
+            for f in files:
+                f['digests'] = {}
+    return data
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pypi = FakePyPI({'app': {'1.0': ['lib>=1']}, 'lib': {'1.0': None}, 'tool': {'1.0': None, '2.0': None}})
+    pips = PIPS()
+    monkeypatch.setattr(pips, 'get_pypi_info', pypi)
+    (tmp_path / 'requirements.txt').write_text('app\ntool<2\n')
+    return pips, pypi, tmp_path
+
+
+def test_release_files_normalises_version_keys_and_skips_unusable_files():
+    project = {'releases': {'1.0.0': [artifact('demo', '1.0.0'), artifact('old', '1.0.0', yanked=True),
+                                      artifact('bare', '1.0.0', digest=False)]}}
+    assert [f['filename'] for f in release_files(project, None, '1.0')] == ['demo-1.0.0-py3-none-any.whl']
+    release = {'urls': [artifact('demo', '1.0')]}
+    assert [f['filename'] for f in release_files({'releases': {}}, release, '1.0')] == ['demo-1.0-py3-none-any.whl']
+
+
+def test_changed_names_compares_requirement_lines_by_name():
+    lockfile = Lockfile(['requests >= 2', 'Flask', 'click'], '3.11.0', {})
+    assert lockfile.changed_names(['requests>=2', 'flask', 'click>8', 'rich']) == ['click', 'flask', 'rich']
+
+
+def test_relock_reuses_unchanged_pins_and_their_hashes(project):
+    pips, pypi, root = project
+    first = pips.lock(['requirements.txt'])
+    assert {name: p['version'] for name, p in first.packages.items()} == {'app': '1.0', 'lib': '1.0', 'tool': '1.0'}
+
+    pypi.index['app']['2.0'] = ['lib>=1']
+    (root / 'requirements.txt').write_text('app\ntool\n')
+    pypi.calls.clear()
+    second = pips.lock(['requirements.txt'])
+
+    assert {name: p['version'] for name, p in second.packages.items()} == {'app': '1.0', 'lib': '1.0', 'tool': '2.0'}
+    assert {name for name, _ in pypi.calls} == {'tool'}
+    assert second.packages['app']['files'] == first.packages['app']['files']
+
+
+def test_upgrade_package_resolves_it_again(project):
+    pips, pypi, root = project
+    pips.lock(['requirements.txt'])
+    pypi.index['app']['2.0'] = ['lib>=1']
+    relocked = pips.lock(['requirements.txt', '-P', 'app'])
+    assert relocked.packages['app']['version'] == '2.0'
+
+
+def test_lock_install_passes_every_hash_to_pip(project, monkeypatch):
+    pips, pypi, root = project
+    pips.lock(['requirements.txt'])
+    installed = []
+    monkeypatch.setattr(pips, 'install_batch', lambda pip_cmd, specs, **kwargs: installed.extend(specs) or True)
+    pips.lock(['--install'])
+    assert installed == [f"{name}==1.0 --hash=sha256:{f'{name}1.0'.ljust(64, '0')}" for name in ('app', 'lib', 'tool')]
+
+
+def test_pin_without_hashes_fails_the_lock(project, monkeypatch):
+    pips, pypi, root = project
+    unhashed = FakePyPI(pypi.index)
+    monkeypatch.setattr(pips, 'get_pypi_info', lambda name, version=None: strip_digests(unhashed(name, version), 'lib'))
+    with pytest.raises(SystemExit):
+        pips.lock(['requirements.txt'])
+    assert not (root / 'pipr.lock').exists()
+
+
+def test_lock_install_refuses_a_lockfile_with_unhashed_pins(project, monkeypatch):
+    pips, pypi, root = project
+    lockfile = pips.lock(['requirements.txt'])
+    lockfile.packages['lib']['files'] = []
+    lockfile.save(root / 'pipr.lock')
+    monkeypatch.setattr(pips, 'install_batch', lambda *args, **kwargs: pytest.fail('pip ran'))
+    with pytest.raises(SystemExit):
+        pips.lock(['--install'])
+
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pips.mirror import MirrorSync
+
+
+def test_missing_page_is_refetched_without_etag(tmp_path, monkeypatch):
+    mirror = MirrorSync(tmp_path, downloader_factory=lambda project: None)
+    mirror.state['projects']['demo'] = {'spec': '', 'etag': '"abc"', 'serial': 1, 'files': {}}
+    sent = []
+
+    def fetch_metadata(name, etag):
+        sent.append(etag)
+        if etag:
+            return 304, None, etag
+        return 200, {'info': {'name': 'demo'}, 'releases': {}, 'urls': [], 'last_serial': 2}, '"def"'
+
+    monkeypatch.setattr(mirror, '_fetch_metadata', fetch_metadata)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        summary = mirror._sync_project('demo', None, pool)
+    assert sent == [None]
+    assert summary['changed']
+    assert (tmp_path / 'simple' / 'demo' / 'index.html').is_file()
@@ -0,0 +1,48 @@
+import zipfile
+from types import SimpleNamespace
+
+from pips.modulemap import ModuleIndex
+
+
+def make_wheel(directory, name, version, files, top_level):
+    path = directory / f"{name}-{version}-py3-none-any.whl"
+    dist_info = f"{name}-{version}.dist-info"
+    with zipfile.ZipFile(path, 'w') as zf:
+        for file in files:
+            zf.writestr(file, '')
+        zf.writestr(f"{dist_info}/top_level.txt", top_level + '\n')
+        zf.writestr(f"{dist_info}/RECORD", '')
+    return path
+
+
+def google_index(tmp_path):
+    wheels = tmp_path / 'wheels'
+    wheels.mkdir()
+    make_wheel(wheels, 'protobuf', '5.0.0', ['google/protobuf/__init__.py', 'google/protobuf/json_format.py'], 'google')
+    make_wheel(wheels, 'google_auth', '2.0.0', ['google/auth/__init__.py', 'google/oauth2/__init__.py'], 'google')
+    make_wheel(wheels, 'googleapis_common_protos', '1.0.0', ['google/api/__init__.py', 'google/rpc/__init__.py'], 'google')
+    make_wheel(wheels, 'PyJWT', '2.0.0', ['jwt/__init__.py'], 'jwt')
+    installed = SimpleNamespace(dists={})
+    return ModuleIndex(installed, wheel_dirs=[wheels], index_file=tmp_path / 'modules.json').refresh()
+
+
+def test_namespace_import_matches_longest_prefix(tmp_path):
+    index = google_index(tmp_path)
+    assert index.distributions('google.protobuf') == ['protobuf']
+    assert index.distributions('google.protobuf.json_format') == ['protobuf']
+    assert index.distributions('google.oauth2') == ['google-auth']
+    assert index.distributions('jwt') == ['PyJWT']
+
+
+def test_bare_namespace_import_stays_ambiguous(tmp_path):
+    index = google_index(tmp_path)
+    assert len(index.distributions('google')) == 3
+
+
+def test_installed_namespace_packages(tmp_path):
+    installed = SimpleNamespace(dists={
+        'google-auth': {'name': 'google-auth', 'top_level': ['google'], 'namespaces': ['google.auth']},
+        'protobuf': {'name': 'protobuf', 'top_level': ['google'], 'namespaces': ['google.protobuf']},
+    })
+    index = ModuleIndex(installed, wheel_dirs=[], index_file=tmp_path / 'modules.json')
+    assert index.distributions('google.protobuf') == ['protobuf']
@@ -0,0 +1,48 @@
+import pytest
+from packaging.version import Version
+
+from pips.pipr import PIPS
+
+
+class StubProvider:
+    """project()/candidates() over {name: (latest, requires_python, [installable versions])}"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def project(self, name):
+        if name not in self.index:
+            return None
+        latest, requires_python, _ = self.index[name]
+        return {'info': {'name': name, 'version': latest, 'requires_python': requires_python}}
+
+    def candidates(self, name):
+        return sorted((Version(v) for v in self.index[name][2]), reverse=True)
+
+
+PROVIDER = StubProvider({
+    'fresh': ('2.0', None, ['1.0', '2.0']),
+    'newpy': ('3.0', '>=3.12', ['1.0', '2.0']),
+    'stuck': ('3.0', '>=3.12', ['2.0']),
+    'beta': ('1.0', None, ['1.0', '1.1rc1']),
+})
+
+
+@pytest.mark.parametrize('name, installed, pre, expected', [
+    ('fresh', '1.0', False, ('upgrade', '2.0')),
+    ('fresh', '2.0', False, ('current', None)),
+    ('newpy', '1.0', False, ('partial', '2.0')),
+    ('stuck', '2.0', False, ('blocked', None)),
+    ('beta', '1.0', False, ('current', None)),
+    ('beta', '1.0', True, ('upgrade', '1.1rc1')),
+    ('beta', '1.1a1', False, ('upgrade', '1.1rc1')),
+    ('ghost', '1.0', False, ('unknown', None)),
+])
+def test_outdated_row(name, installed, pre, expected):
+    row = PIPS()._outdated_row(PROVIDER, {'name': name, 'version': installed}, pre)
+    assert (row['status'], row['upgrade']) == expected
+
+
+def test_partial_row_names_the_python_the_latest_release_needs():
+    row = PIPS()._outdated_row(PROVIDER, {'name': 'newpy', 'version': '1.0'})
+    assert (row['latest'], row['requires_python']) == ('3.0', '>=3.12')
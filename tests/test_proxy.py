@@ -0,0 +1,56 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from pips.proxy import InFlight, PipsProxy
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get_raw(port, path):
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+    with sock:
+        sock.sendall(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+        data = b''
+        while chunk := sock.recv(65536):
+            data += chunk
+    return data
+
+
+@pytest.fixture
+def proxy(tmp_path):
+    proxy = PipsProxy(client=None, downloader_factory=lambda project: None, root=tmp_path)
+    port = free_port()
+    threading.Thread(target=proxy.serve, args=('127.0.0.1', port), daemon=True).start()
+    return proxy, port
+
+
+def test_failed_stream_truncates_the_download_without_an_error_page(tmp_path, proxy, monkeypatch):
+    proxy, port = proxy
+    inflight = InFlight(tmp_path / 'demo.whl.part', tmp_path / 'demo.whl', size=10)
+    monkeypatch.setattr(proxy, 'open_file', lambda project, filename: (None, inflight))
+
+    def stream(inflight, write):
+        write(b'abc')
+        raise IOError('upstream reset')
+    monkeypatch.setattr(proxy, 'stream', stream)
+
+    response = get_raw(port, '/files/demo/demo-1.0-py3-none-any.whl')
+    head, body = response.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.0 200')
+    assert b'Content-Length: 10' in head
+    assert body == b'abc'
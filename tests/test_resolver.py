@@ -0,0 +1,60 @@
+import pytest
+
+from pips.resolver import PyPIProvider, Resolver, ResolutionError, ResolutionTooDeep
+
+
+def make_provider(index):
+    """PyPIProvider over an in-memory index: {name: {version: [requires_dist]}}"""
+    def latest(name):
+        return max(index[name], key=lambda v: tuple(int(p) for p in v.split('.')))
+
+    def fetch_project(name):
+        if name not in index:
+            return None
+        return {'info': {'name': name, 'version': latest(name), 'requires_dist': index[name][latest(name)]},
+                'releases': {v: [{'filename': f'{name}-{v}.tar.gz', 'requires_python': None}] for v in index[name]}}
+
+    def fetch_version(name, version):
+        if version not in index.get(name, {}):
+            return None
+        return {'info': {'name': name, 'version': version, 'requires_dist': index[name][version]}}
+
+    return PyPIProvider(fetch_project, fetch_version, python_version='3.11.0', workers=2)
+
+
+# app 2.0 pins lib 1, which tool rules out: only app 1.0 works
+BACKTRACK = {
+    'app': {'1.0': ['lib'], '2.0': ['lib==1.0']},
+    'lib': {'1.0': [], '2.0': []},
+    'tool': {'1.0': ['lib>=2']},
+}
+
+
+def test_dead_end_backtracks_to_an_older_release():
+    provider = make_provider(BACKTRACK)
+    resolution = Resolver(provider).resolve(['app', 'tool'])
+    assert resolution.lines() == ['app==1.0', 'lib==2.0', 'tool==1.0']
+    assert resolution.required_by('lib') == ['app', 'tool']
+    assert resolution.rounds > len(resolution.pins)
+
+
+def test_conflict_is_reduced_to_the_requirements_that_exclude_every_release():
+    provider = make_provider(BACKTRACK)
+    with pytest.raises(ResolutionError) as error:
+        Resolver(provider).resolve(['lib<2', 'tool', 'app'])
+    assert sorted(error.value.causes) == [('lib<2', None), ('lib>=2', 'tool')]
+    assert error.value.name == 'lib'
+
+
+def test_unknown_project_is_reported_as_the_cause():
+    provider = make_provider({'app': {'1.0': ['ghost>=1']}})
+    with pytest.raises(ResolutionError) as error:
+        Resolver(provider).resolve(['app'])
+    assert error.value.causes == [('ghost>=1', 'app')]
+    assert 'ghost was not found on PyPI' in str(error.value)
+
+
+def test_max_rounds_gives_up():
+    provider = make_provider(BACKTRACK)
+    with pytest.raises(ResolutionTooDeep):
+        Resolver(provider, max_rounds=2).resolve(['app', 'tool'])
@@ -0,0 +1,25 @@
+from pips.scanner import module_header, parse_imports, scan_imports
+
+COMPOUND = """\
+try: import ujson as json
+except ImportError: import json
+if not re: import re
+x = 1; import os.path
+"""
+
+
+def test_imports_after_compound_statement_colon():
+    assert scan_imports(COMPOUND) == {'ujson', 'json', 're', 'os.path'}
+    assert scan_imports(COMPOUND) == parse_imports(COMPOUND)
+
+
+def test_strings_and_comments_are_ignored():
+    source = "s = 'import fake'\n# import nope\nfrom google.protobuf import json_format\nfrom . import local\n"
+    assert scan_imports(source) == {'google.protobuf'}
+
+
+def test_top_mode_stops_at_the_header_end():
+    source = '"""\ndef not_a_header\n"""\nimport a\n# class nope\nimport b\ndef f():\n    import c\n'
+    assert module_header(source).endswith('import b\n')
+    assert scan_imports(source, top_only=True) == {'a', 'b'}
+    assert scan_imports(source) == {'a', 'b', 'c'}
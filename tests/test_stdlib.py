@@ -0,0 +1,26 @@
+from pips.stdlib import first_party_from_paths, first_party_near, stdlib_modules
+
+
+def test_nested_module_stems_are_not_first_party():
+    paths = ['manage.py', 'proj/__init__.py', 'proj/celery.py', 'proj/redis.py', 'proj/settings.py']
+    assert first_party_from_paths(paths) == {'manage', 'proj'}
+
+
+def test_src_layout_and_namespace_directories():
+    paths = ['src/mylib/core.py', 'tools/run.py', 'setup_helpers.py']
+    assert first_party_from_paths(paths) == {'mylib', 'tools', 'setup_helpers'}
+
+
+def test_single_file_inside_a_package_does_not_see_its_siblings(tmp_path):
+    (tmp_path / 'pyproject.toml').write_text('')
+    package = tmp_path / 'proj'
+    package.mkdir()
+    for name in ('__init__.py', 'celery.py', 'tasks.py'):
+        (package / name).write_text('')
+    assert first_party_near(package / 'tasks.py') == {'proj'}
+
+
+def test_stdlib_modules():
+    modules = stdlib_modules()
+    assert {'os', 'json', '__future__', '__main__'} <= modules
+    assert 'typing_extensions' not in modules
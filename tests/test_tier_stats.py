@@ -0,0 +1,45 @@
+import atexit
+import json
+
+from pips.pips import PyPIClient, TierStats
+
+
+def make_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(PyPIClient, 'CACHE_DIR', tmp_path / 'cache')
+    client = PyPIClient(use_cache=True, use_redis=False, use_daemon=False,
+                        tier_stats=TierStats(max_failures=3, cooldown=300, persist=False))
+    source = tmp_path / 'project.json'
+    source.write_text(json.dumps({'info': {'name': 'demo'}}))
+    return client, source.as_uri()
+
+
+def test_repeated_tier_failures_disable_the_tier(tmp_path, monkeypatch):
+    client, url = make_client(tmp_path, monkeypatch)
+    for _ in range(3):
+        client._get_cache_path('package_info:demo').write_bytes(b'not a pickle')
+        assert client._fetch_json(url, 'package_info:demo') == {'info': {'name': 'demo'}}
+    assert client.tier_stats.is_disabled('file')
+    assert client.tier_stats.latency('file') is None
+
+
+def test_skipped_tier_is_not_a_latency_sample(tmp_path, monkeypatch):
+    client, url = make_client(tmp_path, monkeypatch)
+    client.use_redis = True
+    monkeypatch.setattr(PyPIClient, 'redis_client', property(lambda self: None))
+    client._fetch_json(url, 'package_info:demo')
+    assert client.tier_stats.latency('redis') is None
+    assert client.tier_stats.latency('file') is not None
+
+
+def test_clients_share_one_persisted_stats_object(tmp_path, monkeypatch):
+    monkeypatch.setattr(PyPIClient, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(TierStats, 'STATS_FILE', tmp_path / 'tier_stats.json')
+    monkeypatch.setattr(TierStats, '_shared', None)
+    hooks = []
+    monkeypatch.setattr(atexit, 'register', hooks.append)
+    (tmp_path / 'tier_stats.json').write_text(json.dumps({'file': {'samples': [0.5]}}))
+
+    clients = [PyPIClient(use_cache=True, use_redis=False, use_daemon=False) for _ in range(3)]
+    assert all(client.tier_stats is clients[0].tier_stats for client in clients)
+    assert clients[0].tier_stats.latency('file') == 0.5
+    assert len(hooks) == 1
@@ -0,0 +1,37 @@
+import subprocess
+
+from pips.venvcache import VenvCache, venv_python
+
+
+def fake_venv(monkeypatch):
+    """python -m venv writes an interpreter stub, every other command is recorded"""
+    commands = []
+
+    def check_call(cmd, **kwargs):
+        python = venv_python(cmd[-1])
+        python.parent.mkdir(parents=True)
+        python.write_text('')
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, '', 'no network')
+
+    monkeypatch.setattr(subprocess, 'check_call', check_call)
+    monkeypatch.setattr(subprocess, 'run', run)
+    return commands
+
+
+def test_template_keeps_the_bundled_pip_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv('PIPS_VENV_UPGRADE_PIP', raising=False)
+    commands = fake_venv(monkeypatch)
+    template = VenvCache(tmp_path).template()
+    assert venv_python(template).exists()
+    assert commands == []
+
+
+def test_pip_upgrade_is_opt_in_and_its_failure_is_not_fatal(tmp_path, monkeypatch):
+    monkeypatch.setenv('PIPS_VENV_UPGRADE_PIP', '1')
+    commands = fake_venv(monkeypatch)
+    template = VenvCache(tmp_path).template()
+    assert venv_python(template).exists()
+    assert [cmd[1:] for cmd in commands] == [['-m', 'pip', 'install', '--upgrade', '--quiet', 'pip']]
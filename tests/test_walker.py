@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+from pips.walker import compile_rule, is_ignored, iter_python_files
+
+
+def ignored(patterns, relpath, is_dir=False, base=''):
+    return is_ignored(relpath, is_dir, [compile_rule(p, base) for p in patterns])
+
+
+@pytest.mark.parametrize('relpath, expected', [
+    ('build', True),
+    ('src/build', False),
+])
+def test_leading_slash_anchors_to_the_gitignore_directory(relpath, expected):
+    assert ignored(['/build'], relpath, is_dir=True) is expected
+
+
+@pytest.mark.parametrize('pattern, relpath, expected', [
+    ('docs/conf.py', 'docs/conf.py', True),
+    ('docs/conf.py', 'pkg/docs/conf.py', False),
+    ('conf.py', 'pkg/docs/conf.py', True),
+    ('*.py', 'pkg/mod.py', True),
+    ('pkg/*.py', 'pkg/sub/mod.py', False),
+    ('mod?.py', 'mod1.py', True),
+    ('mod[!0-9].py', 'mod1.py', False),
+])
+def test_middle_slash_anchors_and_globs_stay_in_one_segment(pattern, relpath, expected):
+    assert ignored([pattern], relpath) is expected
+
+
+def test_directory_only_patterns_skip_files():
+    assert ignored(['cache/'], 'cache', is_dir=True)
+    assert not ignored(['cache/'], 'cache')
+
+
+@pytest.mark.parametrize('pattern, relpath, expected', [
+    ('**/fixtures', 'fixtures', True),
+    ('**/fixtures', 'a/b/fixtures', True),
+    ('a/**/c.py', 'a/c.py', True),
+    ('a/**/c.py', 'a/x/y/c.py', True),
+    ('a/**', 'a/x/y.py', True),
+    ('a/**', 'a', False),
+])
+def test_double_star(pattern, relpath, expected):
+    assert ignored([pattern], relpath) is expected
+
+
+def test_last_matching_rule_wins_with_negation():
+    assert not ignored(['*.py', '!keep.py'], 'keep.py')
+    assert ignored(['*.py', '!keep.py', 'keep.py'], 'keep.py')
+    assert ignored(['*.py', '!keep.py'], 'drop.py')
+
+
+def test_nested_gitignore_only_applies_below_its_directory():
+    assert ignored(['/gen.py'], 'pkg/gen.py', base='pkg')
+    assert not ignored(['/gen.py'], 'gen.py', base='pkg')
+    assert not ignored(['/gen.py'], 'pkg/sub/gen.py', base='pkg')
+
+
+def make_tree(root, paths):
+    for path in paths:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text('')
+
+
+def walk(root, **kwargs):
+    return [os.path.relpath(path, root).replace(os.sep, '/') for path in iter_python_files(root, **kwargs)]
+
+
+def test_walk_prunes_ignored_trees_and_environments(tmp_path, monkeypatch):
+    monkeypatch.delenv('PIPS_SCAN_EXCLUDE', raising=False)
+    make_tree(tmp_path, [
+        'app.py', 'pkg/__init__.py', 'pkg/gen.py', 'pkg/keep_gen.py', 'pkg/sub/gen.py',
+        'generated/out.py', 'notes.txt',
+        '.venv-custom/pyvenv.cfg', '.venv-custom/lib/mod.py',
+        'envs/ml/conda-meta/history', 'envs/ml/lib/mod.py',
+        'node_modules/dep/index.py', 'build/lib/mod.py', 'demo.egg-info/mod.py', '.git/hooks/hook.py',
+        'pkg/__pycache__/gen.py',
+    ])
+    (tmp_path / '.gitignore').write_text('# generated code\ngenerated/\n')
+    (tmp_path / 'pkg' / '.gitignore').write_text('/gen.py\n*gen.py\n!keep_gen.py\n')
+
+    assert walk(tmp_path) == ['app.py', 'pkg/__init__.py', 'pkg/keep_gen.py']
+    assert walk(tmp_path, use_gitignore=False) == [
+        'app.py', 'generated/out.py', 'pkg/__init__.py', 'pkg/gen.py', 'pkg/keep_gen.py', 'pkg/sub/gen.py',
+    ]
+    assert walk(tmp_path, recursive=False) == ['app.py']
+
+
+def test_default_excludes_can_be_extended_or_replaced(tmp_path, monkeypatch):
+    make_tree(tmp_path, ['app.py', 'vendor/lib.py', 'build/mod.py'])
+    monkeypatch.setenv('PIPS_SCAN_EXCLUDE', 'vendor/, unused.py')
+    assert walk(tmp_path) == ['app.py']
+    assert walk(tmp_path, excludes=['vendor/']) == ['app.py', 'build/mod.py']
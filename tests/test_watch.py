@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+
+import pytest
+
+import pips.watch
+from pips.pipr import PIPS
+from pips.watch import EVENT_HEADER, IN_Q_OVERFLOW, InotifyWatcher, PollingWatcher, Watcher
+
+
+def test_backend_without_poll_fails_at_construction(tmp_path):
+    class Incomplete(Watcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path)
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    (tmp_path / 'app.py').write_text('import os\n')
+    watcher = PollingWatcher(tmp_path, debounce=0.05, interval=0.05)
+    assert watcher.wait(timeout=0.1) == set()
+    (tmp_path / 'requirements.txt').write_text('requests\n')
+    (tmp_path / 'notes.txt').write_text('ignored\n')
+    assert watcher.wait(timeout=1.0) == {str(tmp_path / 'requirements.txt')}
+
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is Linux only')
+
+
+@linux_only
+def test_inotify_watcher_reports_changed_files(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    with InotifyWatcher(tmp_path, debounce=0.05) as watcher:
+        assert watcher.wait(timeout=0.1) == set()
+        (tmp_path / 'pkg' / 'mod.py').write_text('import os\n')
+        (tmp_path / 'requirements.txt').write_text('requests\n')
+        (tmp_path / 'notes.txt').write_text('ignored\n')
+        assert watcher.wait(timeout=1.0) == {str(tmp_path / 'pkg' / 'mod.py'), str(tmp_path / 'requirements.txt')}
+
+
+def overflowing_watcher(root):
+    """InotifyWatcher whose event stream is a pipe the test writes inotify events into"""
+    watcher = InotifyWatcher(root, debounce=0.05)
+    os.close(watcher.fd)
+    watcher.fd, watcher.events = os.pipe()
+    return watcher
+
+
+@linux_only
+def test_inotify_queue_overflow_reports_the_root(tmp_path):
+    with overflowing_watcher(tmp_path) as watcher:
+        os.write(watcher.events, EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0))
+        assert watcher.wait(timeout=1.0) == {str(tmp_path)}
+        os.close(watcher.events)
+
+
+@linux_only
+def test_watch_rereads_requirements_after_an_overflow(tmp_path, monkeypatch):
+    (tmp_path / 'requirements.txt').write_text('requests\n')
+    watcher = overflowing_watcher(tmp_path)
+    monkeypatch.setattr(pips.watch, 'create_watcher', lambda *args, **kwargs: watcher)
+    pipr = PIPS()
+    monkeypatch.setattr(pipr, 'scan_directory', lambda *args, **kwargs: (set(), set()))
+    rounds = []
+
+    def checked_states(reqs, **kwargs):
+        rounds.append(sorted(name for name, spec in reqs))
+        if len(rounds) == 1:
+            # Edited while the kernel queue was full: only the overflow event arrives
+            (tmp_path / 'requirements.txt').write_text('requests\nrich\n')
+            os.write(watcher.events, EVENT_HEADER.pack(-1, IN_Q_OVERFLOW, 0, 0))
+        else:
+            raise KeyboardInterrupt
+        return [], None
+    monkeypatch.setattr(pipr, 'checked_states', checked_states)
+
+    pipr.watch(argparse.Namespace(FILE=str(tmp_path), recursive=True, exclude=None, no_ignore=False,
+                                  poll=False, jobs=None, scan_mode=None))
+    os.close(watcher.events)
+    assert rounds == [['requests'], ['requests', 'rich']]